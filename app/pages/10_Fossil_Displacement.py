@@ -15,12 +15,12 @@ if root_dir not in sys.path:
 
 # Imports
 from displacement_analysis import *
-from owid_functions import load_owid_data
+from owid_functions import load_owid_data, ENERGY_MIX_COLUMNS
 
 # Load data
 @st.cache_data
 def load_data():
-    return load_owid_data()
+    return load_owid_data(ENERGY_MIX_COLUMNS)
 
 df = load_data()
 
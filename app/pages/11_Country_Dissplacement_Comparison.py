@@ -13,19 +13,17 @@ scripts_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
 if scripts_dir not in sys.path:
     sys.path.append(scripts_dir)
 
-from owid_functions import load_owid_data
+from owid_functions import load_owid_data, ENERGY_MIX_COLUMNS
 from displacement_analysis import compare_displacement_scores
 
 # Load data
 @st.cache_data
-def load_data():
-    return load_owid_data()
+def load_scores():
+    df = load_owid_data(ENERGY_MIX_COLUMNS)
+    return compare_displacement_scores(df), compare_displacement_scores(df, latest_only=False)
 
-df = load_data()
-
-# Run comparison
-displacement_df = compare_displacement_scores(df)
-all_scores_df = compare_displacement_scores(df, latest_only=False)
+# Run comparison (cached across reruns)
+displacement_df, all_scores_df = load_scores()
 
 # ---------------------------
 # 📂 Tabs
@@ -15,17 +15,13 @@ if scripts_dir not in sys.path:
 
 # --- Import modules ---
 from sector_vulnerability import (
-    load_sector_vulnerability_data,
     get_sector_vulnerability_by_country,
     get_latest_sector_scores
 )
+from dataset_registry import get_dataset
 
 # --- Load data ---
-@st.cache_data
-def load_data():
-    return load_sector_vulnerability_data()
-
-df = load_data()
+df = get_dataset("sector_vulnerability")
 
 # --- Country Selector ---
 countries = sorted(df["Name"].dropna().unique())
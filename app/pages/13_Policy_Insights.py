@@ -24,7 +24,7 @@ from policy_analysis import (
     sectoral_coverage_summary,
     get_policy_adoption_year
 )
-from load_edgar import load_edgar_ipcc2006
+from dataset_registry import get_dataset
 
 # --- LOAD DATA ---
 @st.cache_data
@@ -32,7 +32,7 @@ def load_data():
     return load_policy_data("data/gen_info.csv")
 
 df = load_data()
-edgar_df = load_edgar_ipcc2006()
+edgar_df = get_dataset("edgar_ghg")
 
 # --- TABS ---
 tab0, tab1, tab2, tab3, tab4, tab5 = st.tabs([
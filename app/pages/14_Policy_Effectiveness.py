@@ -16,15 +16,15 @@ if scripts_dir not in sys.path:
     sys.path.append(scripts_dir)
 
 # Imports
-from load_edgar import load_edgar_ipcc2006
+from dataset_registry import get_dataset
+from owid_functions import load_owid_data
 
 @st.cache_data
 def load_data():
-    vectors = pd.read_csv("data/policy_vectors.csv").dropna(subset=["jurisdiction"])
-    edgar = load_edgar_ipcc2006()
-    return vectors, edgar
+    return pd.read_csv("data/policy_vectors.csv").dropna(subset=["jurisdiction"])
 
-vectors_df, edgar_df = load_data()
+vectors_df = load_data()
+edgar_df = get_dataset("edgar_ghg")
 
 # Tabs
 tab0, tab1, tab2, tab3, tab4 = st.tabs([
@@ -176,8 +176,7 @@ with tab4:
 
     @st.cache_data
     def load_owid_gdp():
-        df = pd.read_csv("data/owid-energy-data.csv")
-        return df[["iso_code", "year", "gdp"]]
+        return load_owid_data(["iso_code", "year", "gdp"])
 
     gdp_df = load_owid_gdp()
     iso_code = edgar_df[edgar_df["Name"] == country]["Country_code_A3"].iloc[0]
@@ -1,10 +1,16 @@
 import streamlit as st
 import pandas as pd
-from sklearn.decomposition import PCA
-from sklearn.manifold import TSNE
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
 import plotly.express as px
+import os
+import sys
+
+# --- Setup path ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+from vector_analysis import cluster_policies
 
 # --- Page Setup ---
 st.set_page_config(page_title="Policy Clustering", layout="wide")
@@ -37,13 +43,17 @@ df["Policy Type"] = df.apply(infer_policy_type, axis=1)
 X_meta = df[["jurisdiction", "Policy Type"]]
 X = df.drop(columns=["jurisdiction", "Policy Type", *meta_cols], errors="ignore")
 
-# --- Standardize ---
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+# --- Scale, embed and cluster for every k once (cached by data hash) ---
+clustering = cluster_policies(X)
+embeddings = clustering["embeddings"]
 
 # --- Cluster Control (Top, not Sidebar) ---
 st.markdown("### 🔧 Choose Number of Clusters (KMeans)")
 num_clusters = st.slider("Number of Clusters", min_value=2, max_value=10, value=4)
+cluster_labels = clustering["labels"][num_clusters].astype(str)
+
+with st.expander("📐 Inertia and silhouette for k = 2–10"):
+    st.dataframe(clustering["scores"], use_container_width=True)
 
 # --- Tabs ---
 tab0, tab1, tab2, tab3 = st.tabs([
@@ -97,17 +107,13 @@ with tab0:
 with tab1:
     st.subheader("🧬 PCA – Clustered Policy Vectors")
 
-    pca = PCA(n_components=2)
-    pca_result = pca.fit_transform(X_scaled)
     pca_df = pd.DataFrame({
-        "PCA1": pca_result[:, 0],
-        "PCA2": pca_result[:, 1],
+        "PCA1": embeddings["pca"]["PC1"],
+        "PCA2": embeddings["pca"]["PC2"],
         "Jurisdiction": X_meta["jurisdiction"],
         "Policy Type": X_meta["Policy Type"]
     })
-
-    kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
-    pca_df["Cluster"] = kmeans.fit_predict(X_scaled).astype(str)
+    pca_df["Cluster"] = cluster_labels
 
     fig_pca = px.scatter(
         pca_df, x="PCA1", y="PCA2", color="Cluster",
@@ -122,12 +128,9 @@ with tab1:
 with tab2:
     st.subheader("🌀 t-SNE – Clustered Policy Vectors")
 
-    tsne = TSNE(n_components=2, perplexity=5, learning_rate=200, n_iter=1000, random_state=42)
-    tsne_result = tsne.fit_transform(X_scaled)
-
     tsne_df = pd.DataFrame({
-        "tSNE1": tsne_result[:, 0],
-        "tSNE2": tsne_result[:, 1],
+        "tSNE1": embeddings["tsne"]["TSNE1"],
+        "tSNE2": embeddings["tsne"]["TSNE2"],
         "Jurisdiction": X_meta["jurisdiction"],
         "Policy Type": X_meta["Policy Type"],
         "Cluster": pca_df["Cluster"]
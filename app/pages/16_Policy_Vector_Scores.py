@@ -10,7 +10,8 @@ if root_dir not in sys.path:
     sys.path.append(root_dir)
 
 # --- Import function ---
-from policy_vectorizer import score_policy_vector
+from policy_vectorizer import extract_features, vectorize_policies, clean_policy_vectors, feature_timings
+from vector_analysis import PolicyProjectionModel, PROJECTION_MODEL_PATH
 
 # --- Page Config ---
 st.set_page_config(page_title="🧠 Policy Vector Scoring", layout="wide")
@@ -20,19 +21,27 @@ st.title("🧠 Carbon Policy Vector Scores")
 @st.cache_data
 def load_and_score_policy_data():
     df = pd.read_csv("data/gen_info.csv")
-    vectors = df.apply(score_policy_vector, axis=1)
-    df_vectorized = pd.DataFrame(vectors.tolist())
-
-    # Clean: remove empty/invalid rows
-    df_vectorized = df_vectorized.dropna(subset=["jurisdiction"])
-    df_vectorized = df_vectorized[df_vectorized["jurisdiction"].str.strip() != ""]
-    df_vectorized = df_vectorized[df_vectorized["duration_years"] > 0]
-    return df, df_vectorized
-
-raw_df, vector_df = load_and_score_policy_data()
-
-# Optional: Save scored output
-vector_df.to_csv("data/policy_vectors.csv", index=False)
+    # Every registered feature in one pass, then remove empty/invalid rows
+    df_vectorized = clean_policy_vectors(extract_features(df))
+    return df, df_vectorized, feature_timings()
+
+# data/policy_vectors.csv is written by the build step (scripts/build_data.py), not on page load
+raw_df, vector_df, timings = load_and_score_policy_data()
+
+@st.cache_resource
+def load_projection_model(model_mtime):
+    # Fitted in batch by scripts/build_data.py; fit in memory if not built yet,
+    # on the same clustering columns as policy_vectors.csv. Keyed by the
+    # model file's mtime so a rebuild is picked up without a restart.
+    if model_mtime is not None:
+        return PolicyProjectionModel.load()
+    return PolicyProjectionModel.fit(clean_policy_vectors(vectorize_policies(raw_df)))
+
+# Place every policy in the existing clustering without refitting
+projection = load_projection_model(
+    os.path.getmtime(PROJECTION_MODEL_PATH) if os.path.exists(PROJECTION_MODEL_PATH) else None
+)
+vector_df = vector_df.assign(cluster=projection.predict(vector_df))
 
 # --- Tabs ---
 tab0, tab1, tab2 = st.tabs([
@@ -86,6 +95,9 @@ with tab1:
     st.subheader("📋 Raw Vectorized Policy Data")
     st.dataframe(vector_df.head(50), use_container_width=True)
 
+    with st.expander("⏱️ Feature extraction timings"):
+        st.dataframe(timings, use_container_width=True)
+
 # -------------------------------------
 # 🔎 Tab 2: Filter by Policy Type
 # -------------------------------------
@@ -53,7 +53,7 @@ with col3:
 st.markdown("<hr class='thin-line'/>", unsafe_allow_html=True)
 
 # --- Tabs ---
-tab0, tab1 = st.tabs(["📘 Overview", "📊 Price & Inflation Trends"])
+tab0, tab1, tab2 = st.tabs(["📘 Overview", "📊 Price & Inflation Trends", "🌐 Compare Jurisdictions"])
 
 # ----------------------------
 # Tab 0: Overview
@@ -107,43 +107,79 @@ with tab1:
 
         if carbon_df.empty and inflation_df.empty:
             st.warning("No data available for selected range.")
-            st.stop()
-
-        # Charts
-        col1, col2 = st.columns(2)
-        with col1:
-            if not carbon_df.empty:
-                st.plotly_chart(analyzer.generate_price_plot(carbon_df), use_container_width=True)
-            else:
-                st.info("No carbon pricing data available.")
-        with col2:
-            if not inflation_df.empty:
-                st.plotly_chart(analyzer.generate_inflation_plot(inflation_df), use_container_width=True)
-            else:
-                st.info("No inflation data available.")
-
-        # Merged Table View
-        with st.expander("📊 View Combined Data Table"):
-            merged = pd.merge(carbon_df, inflation_df, how="left", on=["year", "country"])
-            display_cols = ["year", "type", "initiative", "price_usd", "inflation_pct"]
-            display_df = merged[display_cols].sort_values("year").rename(columns={
-                "year": "Year",
-                "type": "Instrument Type",
-                "initiative": "Initiative",
-                "price_usd": "Price (USD/tCO₂)",
-                "inflation_pct": "Inflation (%)"
-            })
-            st.dataframe(display_df, height=300)
-
-        # Download
-        if not carbon_df.empty or not inflation_df.empty:
-            csv = merged.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv,
-                file_name=f"carbon_pricing_inflation_{country}.csv",
-                mime="text/csv"
-            )
+        else:
+            # Charts
+            col1, col2 = st.columns(2)
+            with col1:
+                if not carbon_df.empty:
+                    st.plotly_chart(analyzer.generate_price_plot(carbon_df), use_container_width=True)
+                else:
+                    st.info("No carbon pricing data available.")
+            with col2:
+                if not inflation_df.empty:
+                    st.plotly_chart(analyzer.generate_inflation_plot(inflation_df), use_container_width=True)
+                else:
+                    st.info("No inflation data available.")
+
+            # Merged Table View
+            with st.expander("📊 View Combined Data Table"):
+                merged = pd.merge(carbon_df, inflation_df, how="left", on=["year", "country"])
+                display_cols = ["year", "type", "initiative", "price_usd", "inflation_pct"]
+                display_df = merged[display_cols].sort_values("year").rename(columns={
+                    "year": "Year",
+                    "type": "Instrument Type",
+                    "initiative": "Initiative",
+                    "price_usd": "Price (USD/tCO₂)",
+                    "inflation_pct": "Inflation (%)"
+                })
+                st.dataframe(display_df, height=300)
+
+            # Download
+            if not carbon_df.empty or not inflation_df.empty:
+                csv = merged.to_csv(index=False).encode('utf-8')
+                st.download_button(
+                    label="📥 Download CSV",
+                    data=csv,
+                    file_name=f"carbon_pricing_inflation_{country}.csv",
+                    mime="text/csv"
+                )
 
     except Exception as e:
         st.error(f"❌ An error occurred: {str(e)}")
+
+# ----------------------------
+# Tab 2: Compare Jurisdictions
+# ----------------------------
+with tab2:
+    st.header(f"🌐 Carbon Price Comparison ({start_year} to {end_year})")
+    compare = st.multiselect("Jurisdictions", options=available_countries,
+                             default=[c for c in [country] if c in available_countries])
+
+    if compare:
+        # One indexed lookup for every selected jurisdiction
+        compare_df, compare_inflation = analyzer.get_many(compare)
+        compare_df = compare_df[(compare_df["year"] >= start_year) & (compare_df["year"] <= end_year)]
+        compare_inflation = compare_inflation[(compare_inflation["year"] >= start_year) & (compare_inflation["year"] <= end_year)]
+
+        if compare_df.empty:
+            st.info("No carbon pricing data for the selected jurisdictions and years.")
+        else:
+            # Average price across each jurisdiction's initiatives
+            avg_price = (compare_df.assign(price_usd=pd.to_numeric(compare_df["price_usd"], errors="coerce"))
+                         .groupby(["country", "year"], sort=True)["price_usd"].mean().reset_index())
+            fig = go.Figure()
+            for name, subset in avg_price.groupby("country", sort=False):
+                fig.add_trace(go.Scatter(x=subset["year"], y=subset["price_usd"], mode="lines+markers", name=name))
+            fig.update_layout(title="Average Carbon Price by Jurisdiction", xaxis_title="Year",
+                              yaxis_title="Price (USD/tCO2e)")
+            st.plotly_chart(fig, use_container_width=True)
+
+            with st.expander("📊 View Comparison Table"):
+                table = avg_price.merge(compare_inflation[["country", "year", "inflation_pct"]],
+                                        how="left", on=["country", "year"])
+                st.dataframe(table.rename(columns={
+                    "country": "Jurisdiction",
+                    "year": "Year",
+                    "price_usd": "Avg Price (USD/tCO₂)",
+                    "inflation_pct": "Inflation (%)"
+                }), height=300)
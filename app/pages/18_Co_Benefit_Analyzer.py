@@ -21,13 +21,16 @@ from co_benefit_analyzer import (
     merge_co_benefit_data,
     get_country_trends
 )
+from parallel_loader import load_parallel
 
 # --- Load Data ---
 @st.cache_data
 def load_all_data():
-    df_life = load_life_expectancy_data()
-    df_pm25 = load_pm25_data()
-    df_gdp = load_gdp_data()
+    df_life, df_pm25, df_gdp = load_parallel([
+        ("life_expectancy", load_life_expectancy_data),
+        ("pm25", load_pm25_data),
+        ("gdp", load_gdp_data),
+    ])
     merged = merge_co_benefit_data(df_life, df_pm25, df_gdp)
     return merged
 
@@ -11,24 +11,20 @@ if scripts_dir not in sys.path:
     sys.path.append(scripts_dir)
 
 from resilience_index import (
-    load_gain_data,
     latest_gain_snapshot,
     gain_trend_for_country,
     gain_trend_multi,
     top_improvers,
     compute_country_ranks_over_time,
 )
+from dataset_registry import get_dataset
 
 # Page configuration
 st.set_page_config(page_title="🛡️ ND-GAIN Climate Resilience Index", layout="wide")
 st.title("🛡️ ND-GAIN Climate Resilience Index")
 
 # Load data
-@st.cache_data
-def load_data():
-    return load_gain_data()
-
-df_gain = load_data()
+df_gain = get_dataset("nd_gain")
 all_countries = sorted(df_gain["Name"].dropna().unique())
 
 # --- Country selector on top ---
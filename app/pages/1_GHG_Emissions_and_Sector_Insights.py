@@ -11,7 +11,7 @@ root_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
 if root_dir not in sys.path:
     sys.path.append(root_dir)
 
-from load_edgar import load_edgar_ipcc2006, load_edgar_co2, load_edgar_co2bio, load_edgar_ch4, load_edgar_n2o
+from dataset_registry import get_dataset
 from edgar_functions import *
 
 # Load custom style
@@ -24,11 +24,9 @@ local_css("styles.css")
 # ------------------------------
 # LOAD DATA (needed early for country list)
 # ------------------------------
-@st.cache_data
-def get_data():
-    return load_edgar_ipcc2006(), load_edgar_co2(), load_edgar_co2bio(), load_edgar_ch4(), load_edgar_n2o()
-
-df, df_co2, df_co2bio, df_ch4, df_n2o = get_data()
+store = get_dataset("emissions_store")
+df = store.frame("ghg")
+cube = store.cube("ghg")
 
 # ------------------------------
 # PAGE HEADER
@@ -108,21 +106,13 @@ with tab1:
 # TAB 2: Country Summary
 # ------------------------------
 with tab2:
-    df_sel = lambda d: d[(d["Country_code_A3"] == selected_country) & (d["year"] == selected_year)]
-    total_ghg = df_sel(df)["emissions_mtco2e"].sum()
-    total_co2 = df_sel(df_co2)["emissions_mtco2e"].sum()
-    total_co2bio = df_sel(df_co2bio)["emissions_mtco2e"].sum()
-    total_ch4 = df_sel(df_ch4)["emissions_mtco2e"].sum()
-    total_n2o = df_sel(df_n2o)["emissions_mtco2e"].sum()
-
-    # Global totals
-    global_ghg = df[df["year"] == selected_year]["emissions_mtco2e"].sum()
-    global_co2 = df_co2[df_co2["year"] == selected_year]["emissions_mtco2e"].sum()
-    global_co2bio = df_co2bio[df_co2bio["year"] == selected_year]["emissions_mtco2e"].sum()
-    global_ch4 = df_ch4[df_ch4["year"] == selected_year]["emissions_mtco2e"].sum()
-    global_n2o = df_n2o[df_n2o["year"] == selected_year]["emissions_mtco2e"].sum()
-
-    rank = emission_rank(df, selected_country, selected_year)
+    summary = store.summary(selected_country, selected_year)
+    total_ghg, total_co2, total_co2bio, total_ch4, total_n2o = (
+        summary.loc[["ghg", "co2", "co2bio", "ch4", "n2o"], "country_emissions"]
+    )
+    share = summary["share_pct"]
+
+    rank = emission_rank(cube, selected_country, selected_year)
 
     st.markdown(f"### 📋 Emission Summary – {selected_country} ({selected_year})")
     st.markdown(f"""
@@ -135,14 +125,13 @@ with tab2:
     """)
 
     col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("% Global GHG", f"{100*total_ghg/global_ghg:.2f}%")
-    col2.metric("% Global CO₂", f"{100*total_co2/global_co2:.2f}%")
-    col3.metric("% CO₂ Bio", f"{100*total_co2bio/global_co2bio:.2f}%")
-    col4.metric("% CH₄", f"{100*total_ch4/global_ch4:.2f}%")
-    col5.metric("% N₂O", f"{100*total_n2o/global_n2o:.2f}%")
+    col1.metric("% Global GHG", f"{share['ghg']:.2f}%")
+    col2.metric("% Global CO₂", f"{share['co2']:.2f}%")
+    col3.metric("% CO₂ Bio", f"{share['co2bio']:.2f}%")
+    col4.metric("% CH₄", f"{share['ch4']:.2f}%")
+    col5.metric("% N₂O", f"{share['n2o']:.2f}%")
 
-    df_act = df_sel(df).groupby("ipcc_code_2006_for_standard_report_name")["emissions_mtco2e"].sum().reset_index()
-    df_top = df_act.sort_values("emissions_mtco2e", ascending=False).head(10)
+    df_top = top_sectors_by_country_year(cube, selected_country, selected_year, top_n=10)
 
     st.markdown("### 🔝 Top 10 Emitting Activities")
     fig = px.bar(df_top, x="emissions_mtco2e", y="ipcc_code_2006_for_standard_report_name",
@@ -154,10 +143,10 @@ with tab2:
 # ------------------------------
 # Gas Trend Tabs
 # ------------------------------
-def gas_emission_tab(df_gas, label, tab):
+def gas_emission_tab(gas, label, tab):
+    gas_cube = store.cube(gas)
     with tab:
-        df_filtered = df_gas[df_gas["Country_code_A3"] == selected_country]
-        df_trend = df_filtered.groupby("year")["emissions_mtco2e"].sum().reset_index()
+        df_trend = emission_trend(gas_cube, selected_country)
 
         st.markdown(f"### 📈 {label} Emissions Over Time – {selected_country}")
         fig = px.line(df_trend, x="year", y="emissions_mtco2e", title="", markers=True)
@@ -165,20 +154,18 @@ def gas_emission_tab(df_gas, label, tab):
         st.plotly_chart(fig, use_container_width=True, key=f"trend_{label}_{selected_country}")
 
         st.markdown(f"### 🏭 Top 5 Emitting Sectors – {selected_year}")
-        df_year = df_filtered[df_filtered["year"] == selected_year]
-        df_sector = df_year.groupby("ipcc_code_2006_for_standard_report_name")["emissions_mtco2e"].sum().reset_index()
-        df_top5 = df_sector.sort_values(by="emissions_mtco2e", ascending=False).head(5)
+        df_top5 = top_sectors_by_country_year(gas_cube, selected_country, selected_year, top_n=5)
 
         fig2 = px.bar(df_top5, x="emissions_mtco2e", y="ipcc_code_2006_for_standard_report_name", orientation="h",
                      color="emissions_mtco2e", color_continuous_scale="Viridis")
         st.plotly_chart(fig2, use_container_width=True, key=f"sectors_{label}_{selected_country}_{selected_year}")
 
-gas_emission_tab(df, "GHG", tab3)
-gas_emission_tab(df_co2, "CO₂", tab4)
-gas_emission_tab(df_co2bio, "CO₂ Bio", tab5)
-gas_emission_tab(pd.concat([df_co2, df_co2bio]), "Total CO₂", tab6)
-gas_emission_tab(df_ch4, "CH₄", tab7)
-gas_emission_tab(df_n2o, "N₂O", tab8)
+gas_emission_tab("ghg", "GHG", tab3)
+gas_emission_tab("co2", "CO₂", tab4)
+gas_emission_tab("co2bio", "CO₂ Bio", tab5)
+gas_emission_tab("co2_total", "Total CO₂", tab6)
+gas_emission_tab("ch4", "CH₄", tab7)
+gas_emission_tab("n2o", "N₂O", tab8)
 
 # ------------------------------
 # FOOTER
@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
@@ -12,7 +11,6 @@ from streamlit.components.v1 import html
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 SCRIPTS_DIR = os.path.join(BASE_DIR, "scripts")
 DATA_DIR = os.path.join(BASE_DIR, "data")
-GRAPH_PATH = os.path.join(DATA_DIR, "policy_nodes.json")
 
 if SCRIPTS_DIR not in sys.path:
     sys.path.append(SCRIPTS_DIR)
@@ -26,6 +24,9 @@ from activity_emission_factor import (
     get_displacement_ratio,
     build_policy_node,
 )
+from policy_node_store import PolicyNodeStore
+from graph_layout import compute_layout
+from policy_graph_analytics import PolicyGraphEngine
 
 # Streamlit config
 st.set_page_config(page_title="🌿 Policy Graph Builder", layout="wide")
@@ -75,12 +76,37 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
-activity_df = load_activity_table(os.path.join(DATA_DIR, "activity_emission_factor.csv"))
-country_df = load_country_factors(os.path.join(DATA_DIR, "country_composite_factor.csv"))
+# Load data (shared across reruns so the compiled keyword matcher is reused)
+@st.cache_resource
+def load_tables():
+    return (
+        load_activity_table(os.path.join(DATA_DIR, "activity_emission_factor.csv")),
+        load_country_factors(os.path.join(DATA_DIR, "country_composite_factor.csv")),
+    )
+
+activity_df, country_df = load_tables()
+
+@st.cache_resource
+def get_node_store():
+    return PolicyNodeStore()
+
+node_store = get_node_store()
+
+@st.cache_resource
+def get_graph_engine():
+    return PolicyGraphEngine.from_store(node_store)
+
+# Kept in sync incrementally below; rebuilt whenever the store has seen a
+# write the engine did not apply (another session or process)
+graph_engine = get_graph_engine()
+if graph_engine.store_version != node_store.version():
+    get_graph_engine.clear()
+    graph_engine = get_graph_engine()
 
 # Tabs
-input_tab, graph_tab, db_tab = st.tabs(["➕ Add Policy", "🌐 Interactive Graph", "📁 Policy Database"])
+input_tab, graph_tab, db_tab, analytics_tab = st.tabs(
+    ["➕ Add Policy", "🌐 Interactive Graph", "📁 Policy Database", "📊 Graph Analytics"]
+)
 
 # -------------------
 # TAB 1: ADD POLICY
@@ -129,15 +155,8 @@ with input_tab:
                         "Original Text": policy_text  # Store original policy text
                     })
                     
-                    if os.path.exists(GRAPH_PATH):
-                        with open(GRAPH_PATH, 'r') as f:
-                            graph_data = json.load(f)
-                    else:
-                        graph_data = []
-
-                    graph_data.append(policy_node)
-                    with open(GRAPH_PATH, 'w') as f:
-                        json.dump(graph_data, f, indent=2)
+                    version = node_store.add(policy_node)
+                    graph_engine.add(policy_node, store_version=version)
 
                     st.success("✅ Policy added to graph database.")
                 else:
@@ -153,200 +172,201 @@ with input_tab:
 with graph_tab:
     st.header("🌐 Interactive Policy Intent Graph")
     
-    if os.path.exists(GRAPH_PATH):
-        with open(GRAPH_PATH, 'r') as f:
-            policy_nodes = json.load(f)
-
-        graph_intents = sorted(set(p["Graph Intent"] for p in policy_nodes))
+    graph_intents = node_store.graph_intents()
+    if graph_intents:
         selected_intent = st.selectbox("Select Graph Intent", graph_intents, key="graph_intent_select")
 
-        # Get all countries for this intent
-        countries = sorted(set(node["Country"] for node in policy_nodes if node["Graph Intent"] == selected_intent))
+        # Only this intent's nodes are read from the store
+        policy_nodes = node_store.query(graph_intent=selected_intent)
+        countries = node_store.countries(selected_intent)
         
         if len(countries) == 0:
             st.info("No policies found for this intent. Add a policy to begin.")
         else:
-            # Create tabs for each country
-            country_tabs = st.tabs([f"🇺🇳 All Countries"] + [f"🇺🇳 {country}" for country in countries])
+            # Only the selected view is built and laid out
+            country = st.selectbox(
+                "Country View",
+                [None] + countries,
+                format_func=lambda c: "🇺🇳 All Countries" if c is None else f"🇺🇳 {c}",
+                key="graph_country_select",
+            )
+
+            # Create network graph
+            G = nx.DiGraph()
+            
+            # For country-specific view, use country as central node
+            if country:
+                central_node = f"{country} Policies"
+                G.add_node(central_node, 
+                          size=50, 
+                          color='blue',
+                          title=f"{selected_intent} - {country}",
+                          country=country)
+            else:
+                # For "All Countries" view, keep the original central intent
+                central_node = selected_intent
+                G.add_node(central_node, 
+                          size=50, 
+                          color='blue',
+                          title=selected_intent,
+                          country='Global')
             
-            for i, country in enumerate([None] + countries):
-                with country_tabs[i]:
-                    # Create network graph
-                    G = nx.DiGraph()
+            # Add policy nodes
+            for node in policy_nodes:
+                if (node["Graph Intent"] == selected_intent and 
+                    (country is None or node["Country"] == country)):
                     
-                    # For country-specific view, use country as central node
-                    if country:
-                        central_node = f"{country} Policies"
-                        G.add_node(central_node, 
-                                  size=50, 
-                                  color='blue',
-                                  title=f"{selected_intent} - {country}",
-                                  country=country)
-                    else:
-                        # For "All Countries" view, keep the original central intent
-                        central_node = selected_intent
-                        G.add_node(central_node, 
-                                  size=50, 
-                                  color='blue',
-                                  title=selected_intent,
-                                  country='Global')
+                    G.add_node(
+                        node["Policy Node"],
+                        size=node["Node Size"],
+                        color=node["Node Color"],
+                        impact=node["CO₂ Impact (Mt ±)"],
+                        title=node["Policy Title"],
+                        country=node["Country"],
+                        date=node["Date"],
+                        sector=node.get("Sector", "N/A"),
+                        alignment=node.get("Alignment", "Neutral")
+                    )
+                    G.add_edge(central_node, node["Policy Node"])
+
+            # Only show graph if we have nodes
+            if len(G.nodes()) > 1:
+                # Cached per graph; warm-starts from this view's previous layout
+                pos = compute_layout(G, scope=(selected_intent, country))
+                
+                # Create edges for Plotly
+                edge_x = []
+                edge_y = []
+                for edge in G.edges():
+                    x0, y0 = pos[edge[0]]
+                    x1, y1 = pos[edge[1]]
+                    edge_x.extend([x0, x1, None])
+                    edge_y.extend([y0, y1, None])
+
+                edge_trace = go.Scatter(
+                    x=edge_x, y=edge_y,
+                    line=dict(width=1.5, color='#888'),
+                    hoverinfo='none',
+                    mode='lines')
+
+                # Create nodes for Plotly
+                node_x = []
+                node_y = []
+                node_text = []
+                node_size = []
+                node_color = []
+                customdata = []
+                
+                for node in G.nodes():
+                    x, y = pos[node]
+                    node_x.append(x)
+                    node_y.append(y)
+                    node_data = G.nodes[node]
                     
-                    # Add policy nodes
-                    for node in policy_nodes:
-                        if (node["Graph Intent"] == selected_intent and 
-                            (country is None or node["Country"] == country)):
-                            
-                            G.add_node(
-                                node["Policy Node"],
-                                size=node["Node Size"],
-                                color=node["Node Color"],
-                                impact=node["CO₂ Impact (Mt ±)"],
-                                title=node["Policy Title"],
-                                country=node["Country"],
-                                date=node["Date"],
-                                sector=node.get("Sector", "N/A"),
-                                alignment=node.get("Alignment", "Neutral")
-                            )
-                            G.add_edge(central_node, node["Policy Node"])
-
-                    # Only show graph if we have nodes
-                    if len(G.nodes()) > 1:
-                        # Get positions for all nodes using spring layout
-                        pos = nx.spring_layout(G, k=0.8, iterations=100)
-                        
-                        # Create edges for Plotly
-                        edge_x = []
-                        edge_y = []
-                        for edge in G.edges():
-                            x0, y0 = pos[edge[0]]
-                            x1, y1 = pos[edge[1]]
-                            edge_x.extend([x0, x1, None])
-                            edge_y.extend([y0, y1, None])
-
-                        edge_trace = go.Scatter(
-                            x=edge_x, y=edge_y,
-                            line=dict(width=1.5, color='#888'),
-                            hoverinfo='none',
-                            mode='lines')
-
-                        # Create nodes for Plotly
-                        node_x = []
-                        node_y = []
-                        node_text = []
-                        node_size = []
-                        node_color = []
-                        customdata = []
-                        
-                        for node in G.nodes():
-                            x, y = pos[node]
-                            node_x.append(x)
-                            node_y.append(y)
-                            node_data = G.nodes[node]
-                            
-                            # Node text (hover info)
-                            text = f"<b>{node}</b><br>"
-                            if 'title' in node_data:
-                                text += f"Title: {node_data.get('title', 'N/A')}<br>"
-                            if 'country' in node_data:
-                                text += f"Country: {node_data.get('country', 'N/A')}<br>"
-                            if 'impact' in node_data:
-                                text += f"Impact: {node_data.get('impact', 0):.2f} Mt CO₂<br>"
-                            if 'sector' in node_data:
-                                text += f"Sector: {node_data.get('sector', 'N/A')}<br>"
-                            if 'date' in node_data:
-                                text += f"Date: {node_data.get('date', 'N/A')}"
-                            
-                            node_text.append(text)
-                            node_size.append(node_data.get('size', 20) * 2)
-                            node_color.append(node_data.get('color', 'gray'))
-                            customdata.append([
-                                node_data.get('impact', 0), 
-                                node_data.get('title', node),
-                                node_data.get('country', 'Global')
-                            ])
-
-                        node_trace = go.Scatter(
-                            x=node_x, y=node_y,
-                            mode='markers+text',
-                            hoverinfo='text',
-                            textposition='top center',
-                            textfont=dict(size=10),
-                            marker=dict(
-                                showscale=False,
-                                color=node_color,
-                                size=node_size,
-                                line_width=2,
-                                line_color='DarkSlateGrey'
-                            ),
-                            customdata=customdata,
-                            text=[n if len(n) < 20 else n[:17] + "..." for n in G.nodes()],
-                            hovertext=node_text
-                        )
-
-                        # Create the figure with updated layout
-                        title = f'<b>{selected_intent}' + (f' - {country}' if country else '') + '</b>'
-                        fig = go.Figure(data=[edge_trace, node_trace],
-                                     layout=go.Layout(
-                                        title=dict(
-                                            text=title,
-                                            font=dict(size=16)
-                                        ),
-                                        showlegend=False,
-                                        hovermode='closest',
-                                        margin=dict(b=20, l=5, r=5, t=40),
-                                        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                                        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                                        height=700,
-                                        paper_bgcolor='rgba(0,0,0,0)',
-                                        plot_bgcolor='rgba(0,0,0,0)',
-                                        clickmode='event+select'
-                                    ))
-                        
-                        # Add some interactivity
-                        fig.update_traces(
-                            marker=dict(sizemode='diameter'),
-                            selector=dict(mode='markers+text')
-                        )
-                        
-                        # Display the graph
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        # Node details section
-                        st.markdown("### Node Details")
-                        st.markdown("Click on a node in the graph to see details here", 
-                                   help="Node information will appear here after selection")
-                        
-                        # Placeholder for node details (will be filled by JavaScript)
-                        node_details = st.empty()
-                        
-                        # JavaScript to handle node clicks and update Streamlit
-                        html("""
-                        <script>
-                        const doc = window.parent.document;
-                        const iframe = doc.querySelector('iframe[title="streamlitApp"]');
-                        const stComm = iframe.contentWindow.parent.document;
+                    # Node text (hover info)
+                    text = f"<b>{node}</b><br>"
+                    if 'title' in node_data:
+                        text += f"Title: {node_data.get('title', 'N/A')}<br>"
+                    if 'country' in node_data:
+                        text += f"Country: {node_data.get('country', 'N/A')}<br>"
+                    if 'impact' in node_data:
+                        text += f"Impact: {node_data.get('impact', 0):.2f} Mt CO₂<br>"
+                    if 'sector' in node_data:
+                        text += f"Sector: {node_data.get('sector', 'N/A')}<br>"
+                    if 'date' in node_data:
+                        text += f"Date: {node_data.get('date', 'N/A')}"
+                    
+                    node_text.append(text)
+                    node_size.append(node_data.get('size', 20) * 2)
+                    node_color.append(node_data.get('color', 'gray'))
+                    customdata.append([
+                        node_data.get('impact', 0), 
+                        node_data.get('title', node),
+                        node_data.get('country', 'Global')
+                    ])
+
+                node_trace = go.Scatter(
+                    x=node_x, y=node_y,
+                    mode='markers+text',
+                    hoverinfo='text',
+                    textposition='top center',
+                    textfont=dict(size=10),
+                    marker=dict(
+                        showscale=False,
+                        color=node_color,
+                        size=node_size,
+                        line_width=2,
+                        line_color='DarkSlateGrey'
+                    ),
+                    customdata=customdata,
+                    text=[n if len(n) < 20 else n[:17] + "..." for n in G.nodes()],
+                    hovertext=node_text
+                )
+
+                # Create the figure with updated layout
+                title = f'<b>{selected_intent}' + (f' - {country}' if country else '') + '</b>'
+                fig = go.Figure(data=[edge_trace, node_trace],
+                             layout=go.Layout(
+                                title=dict(
+                                    text=title,
+                                    font=dict(size=16)
+                                ),
+                                showlegend=False,
+                                hovermode='closest',
+                                margin=dict(b=20, l=5, r=5, t=40),
+                                xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                                yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                                height=700,
+                                paper_bgcolor='rgba(0,0,0,0)',
+                                plot_bgcolor='rgba(0,0,0,0)',
+                                clickmode='event+select'
+                            ))
+                
+                # Add some interactivity
+                fig.update_traces(
+                    marker=dict(sizemode='diameter'),
+                    selector=dict(mode='markers+text')
+                )
+                
+                # Display the graph
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Node details section
+                st.markdown("### Node Details")
+                st.markdown("Click on a node in the graph to see details here", 
+                           help="Node information will appear here after selection")
+                
+                # Placeholder for node details (will be filled by JavaScript)
+                node_details = st.empty()
+                
+                # JavaScript to handle node clicks and update Streamlit
+                html("""
+                <script>
+                const doc = window.parent.document;
+                const iframe = doc.querySelector('iframe[title="streamlitApp"]');
+                const stComm = iframe.contentWindow.parent.document;
+                
+                // Listen for Plotly click events
+                iframe.contentWindow.addEventListener('plotly_click', function(event) {
+                    const point = event.points[0];
+                    if (point) {
+                        const impact = point.customdata[0];
+                        const title = point.customdata[1];
+                        const country = point.customdata[2];
+                        const text = point.hovertext;
                         
-                        // Listen for Plotly click events
-                        iframe.contentWindow.addEventListener('plotly_click', function(event) {
-                            const point = event.points[0];
-                            if (point) {
-                                const impact = point.customdata[0];
-                                const title = point.customdata[1];
-                                const country = point.customdata[2];
-                                const text = point.hovertext;
-                                
-                                // Find the Streamlit text area and update it
-                                const textAreas = stComm.querySelectorAll('.stTextArea textarea');
-                                if (textAreas.length > 0) {
-                                    textAreas[0].value = `Selected Node: ${point.text}\\n\\n${text}`;
-                                    textAreas[0].dispatchEvent(new Event('input', {bubbles: true}));
-                                }
-                            }
-                        });
-                        </script>
-                        """, height=0)
-                    else:
-                        st.info(f"No policies found for {country if country else 'this intent'}")
+                        // Find the Streamlit text area and update it
+                        const textAreas = stComm.querySelectorAll('.stTextArea textarea');
+                        if (textAreas.length > 0) {
+                            textAreas[0].value = `Selected Node: ${point.text}\\n\\n${text}`;
+                            textAreas[0].dispatchEvent(new Event('input', {bubbles: true}));
+                        }
+                    }
+                });
+                </script>
+                """, height=0)
+            else:
+                st.info(f"No policies found for {country if country else 'this intent'}")
     else:
         st.info("No policy data available. Add a policy to begin.")
 
@@ -357,10 +377,8 @@ with graph_tab:
 
 with db_tab:
     st.header("📁 Policy Graph Dataset")
-    if os.path.exists(GRAPH_PATH):
-        with open(GRAPH_PATH, 'r') as f:
-            graph_data = json.load(f)
-
+    graph_data = node_store.all()
+    if graph_data:
         df = pd.DataFrame(graph_data)
         
         # Convert date strings to datetime for proper filtering
@@ -494,11 +512,41 @@ with db_tab:
                 )
                 
                 if st.button("Delete Selected Policy", key="delete_button"):
-                    updated_data = [node for node in graph_data if node["Policy Node"] != selected_display]
-                    with open(GRAPH_PATH, 'w') as f:
-                        json.dump(updated_data, f, indent=2)
+                    version = node_store.delete(selected_display)
+                    graph_engine.remove(selected_display, store_version=version)
                     st.success(f"✅ Deleted selected policy. Please refresh page.")
             else:
                 st.warning("No deletable policies found in current filters")
         else:
-            st.warning("No policies match current filters")
\ No newline at end of file
+            st.warning("No policies match current filters")
+
+# -------------------
+# TAB 4: ANALYTICS
+# -------------------
+with analytics_tab:
+    st.header("📊 Policy Graph Analytics")
+    if len(graph_engine) == 0:
+        st.info("No policy data available. Add a policy to begin.")
+    else:
+        intent_choice = st.selectbox("Graph Intent", ["All"] + node_store.graph_intents(), key="analytics_intent")
+        intent_filter = None if intent_choice == "All" else intent_choice
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Impact by Sector")
+            st.dataframe(graph_engine.rollup("Sector", graph_intent=intent_filter), hide_index=True,
+                         use_container_width=True)
+        with col2:
+            st.subheader("Impact by Country")
+            st.dataframe(graph_engine.rollup("Country", graph_intent=intent_filter), hide_index=True,
+                         use_container_width=True)
+
+        st.subheader("⚠️ Conflicting Policies (Positive vs Negative in one sector)")
+        conflicts = graph_engine.conflicts(graph_intent=intent_filter)
+        if conflicts.empty:
+            st.success("No conflicting policies found.")
+        else:
+            st.dataframe(conflicts, hide_index=True, use_container_width=True)
+
+        st.subheader("Most Central Nodes")
+        st.dataframe(graph_engine.centrality("pagerank", top_n=15), hide_index=True, use_container_width=True)
@@ -11,7 +11,7 @@ root_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
 if root_dir not in sys.path:
     sys.path.append(root_dir)
 
-from load_edgar import load_edgar_ipcc2006, load_edgar_co2, load_edgar_co2bio, load_edgar_ch4, load_edgar_n2o
+from dataset_registry import get_dataset
 
 # ------------------------------
 # Load CSS
@@ -25,17 +25,8 @@ local_css("styles.css")
 # ------------------------------
 # Load data
 # ------------------------------
-@st.cache_data
-def get_data():
-    return (
-        load_edgar_ipcc2006(),
-        load_edgar_co2(),
-        load_edgar_co2bio(),
-        load_edgar_ch4(),
-        load_edgar_n2o(),
-    )
-
-df_ar5, df_co2, df_co2bio, df_ch4, df_n2o = get_data()
+store = get_dataset("emissions_store")
+df_ar5, df_co2, df_co2bio, df_ch4, df_n2o = (store.frame(gas) for gas in ["ghg", "co2", "co2bio", "ch4", "n2o"])
 
 # ------------------------------
 # PAGE HEADER
@@ -93,16 +84,10 @@ datasets = {
 with tabs[0]:
     st.markdown(f"### 📋 Emission Summary – {selected_sector} in {selected_country} ({selected_year})")
 
-    def extract_emission(df):
-        return df[(df["Country_code_A3"] == selected_country) &
-                  (df["year"] == selected_year) &
-                  (df["ipcc_code_2006_for_standard_report_name"] == selected_sector)]["emissions_mtco2e"].sum()
-
-    val_ar5 = extract_emission(df_ar5)
-    val_co2 = extract_emission(df_co2)
-    val_co2bio = extract_emission(df_co2bio)
-    val_ch4 = extract_emission(df_ch4)
-    val_n2o = extract_emission(df_n2o)
+    summary = store.summary(selected_country, selected_year, sector=selected_sector)
+    val_ar5, val_co2, val_co2bio, val_ch4, val_n2o = (
+        summary.loc[["ghg", "co2", "co2bio", "ch4", "n2o"], "country_emissions"]
+    )
 
     st.markdown(f"""
     In **{selected_country}**, sector **{selected_sector}** emitted in **{selected_year}**:
@@ -116,7 +101,7 @@ with tabs[0]:
     def get_rank(df):
         df_filtered = df[(df["year"] == selected_year) &
                          (df["ipcc_code_2006_for_standard_report_name"] == selected_sector)]
-        df_rank = df_filtered.groupby("Country_code_A3")["emissions_mtco2e"].sum().reset_index()
+        df_rank = df_filtered.groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum().reset_index()
         df_rank = df_rank.sort_values("emissions_mtco2e", ascending=False).reset_index(drop=True)
         try:
             return df_rank[df_rank["Country_code_A3"] == selected_country].index[0] + 1
@@ -158,7 +143,7 @@ def render_tab(tab, gas_label, df_gas):
         # Rank
         df_year_sector = df_gas[(df_gas["year"] == selected_year) &
                                 (df_gas["ipcc_code_2006_for_standard_report_name"] == selected_sector)]
-        df_rank = df_year_sector.groupby("Country_code_A3")["emissions_mtco2e"].sum().reset_index()
+        df_rank = df_year_sector.groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum().reset_index()
         df_rank = df_rank.sort_values("emissions_mtco2e", ascending=False).reset_index(drop=True)
         try:
             rank = df_rank[df_rank["Country_code_A3"] == selected_country].index[0] + 1
@@ -10,7 +10,7 @@ root_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
 if root_dir not in sys.path:
     sys.path.append(root_dir)
 
-from load_edgar import load_edgar_ipcc2006
+from dataset_registry import get_datasets
 from edgar_functions import (
     top_emitters_by_gas,
     compare_emission_trends,
@@ -31,11 +31,7 @@ local_css("styles.css")
 # -------------------------------
 # Load Data
 # -------------------------------
-@st.cache_data
-def get_data():
-    return load_edgar_ipcc2006()
-
-df = get_data()
+df, cube = get_datasets("edgar_ghg", "edgar_ghg_cube")
 
 # -------------------------------
 # Page Header
@@ -80,7 +76,7 @@ with tab1:
     st.markdown("### 📈 Emission Trends Over Time")
     selected_countries = st.multiselect("Select 2–4 Countries", countries, default=["IND", "USA", "CHN"])
     if len(selected_countries) >= 2:
-        trend_df = compare_emission_trends(df, selected_countries)
+        trend_df = compare_emission_trends(cube, selected_countries)
         st.line_chart(trend_df)
     else:
         st.warning("Please select at least 2 countries.")
@@ -91,7 +87,7 @@ with tab1:
 with tab2:
     st.markdown("### 🏭 Sector Emissions Comparison by Country")
     selected_sector = st.selectbox("Select Sector", sectors, key="sector_compare")
-    top_sector_df = compare_sector_by_country(df, selected_sector, selected_year).head(10)
+    top_sector_df = compare_sector_by_country(cube, selected_sector, selected_year).head(10)
 
     st.dataframe(top_sector_df, use_container_width=True)
 
@@ -110,7 +106,7 @@ with tab3:
     selected_radar_countries = st.multiselect("Select 2–5 Countries", countries, default=["IND", "USA"], key="radar_compare")
 
     if 1 < len(selected_radar_countries) <= 5:
-        radar_df = sector_profiles(df, selected_radar_countries, selected_year)
+        radar_df = sector_profiles(cube, selected_radar_countries, selected_year)
         st.dataframe(radar_df, use_container_width=True)
 
         fig3, ax3 = plt.subplots(figsize=(12, 6))
@@ -130,7 +126,7 @@ with tab4:
     selected_stacked_countries = st.multiselect("Select Countries", countries, default=["IND", "USA", "CHN"], key="stacked_compare")
 
     if selected_stacked_countries:
-        stacked_df = stacked_sector_breakdown(df, selected_stacked_countries, selected_year)
+        stacked_df = stacked_sector_breakdown(cube, selected_stacked_countries, selected_year)
         st.dataframe(stacked_df, use_container_width=True)
 
         # Sort columns by emission magnitude
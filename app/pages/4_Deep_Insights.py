@@ -11,7 +11,7 @@ root_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
 if root_dir not in sys.path:
     sys.path.append(root_dir)
 
-from load_edgar import load_edgar_ipcc2006, load_population, load_gdp
+from dataset_registry import get_datasets
 from edgar_functions import (
     sector_contribution,
     fastest_growing_sectors,
@@ -47,11 +47,7 @@ st.markdown(f"""
 # -------------------------------
 # Load & Cache Data
 # -------------------------------
-@st.cache_data
-def get_data():
-    return load_edgar_ipcc2006(), load_population(), load_gdp()
-
-df, df_pop, df_gdp = get_data()
+df, df_pop, df_gdp, cube = get_datasets("edgar_ghg", "population", "gdp", "edgar_ghg_cube")
 
 # -------------------------------
 # Top Filter Bar
@@ -88,9 +84,9 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 with tab1:
     st.markdown(f"### 📊 Cumulative Emissions – {selected_country}")
 
-    cum_5 = cumulative_emissions_n_years(df, selected_country, selected_year, 5)
-    cum_10 = cumulative_emissions_n_years(df, selected_country, selected_year, 10)
-    cum_15 = cumulative_emissions_n_years(df, selected_country, selected_year, 15)
+    cum_5 = cumulative_emissions_n_years(cube, selected_country, selected_year, 5)
+    cum_10 = cumulative_emissions_n_years(cube, selected_country, selected_year, 10)
+    cum_15 = cumulative_emissions_n_years(cube, selected_country, selected_year, 15)
 
     col1, col2, col3 = st.columns(3)
     col1.metric("5-Year Emissions", f"{cum_5:,.0f} MtCO₂e")
@@ -105,7 +101,7 @@ with tab2:
 
     for n in [5, 10, 15]:
         st.markdown(f"#### 🔼 Growth Over Last {n} Years")
-        top_growth = top_growth_countries(df, selected_year, n)
+        top_growth = top_growth_countries(cube, selected_year, n)
         fig = px.bar(top_growth, x="Country_code_A3", y="growth_rate",
                      labels={"growth_rate": "Growth (%)"},
                      title=f"Top 10 Growth Countries – Last {n} Years",
@@ -120,7 +116,7 @@ with tab2:
 with tab3:
     st.markdown(f"### 📏 Country Benchmark – {selected_country} vs Global")
 
-    country_val, global_avg = compare_country_with_global(df, selected_country, selected_year)
+    country_val, global_avg = compare_country_with_global(cube, selected_country, selected_year)
     delta = country_val - global_avg
     delta_pct = (delta / global_avg) * 100
 
@@ -135,7 +131,7 @@ with tab3:
 with tab4:
     st.markdown(f"### 📏 Sector Benchmark – {selected_sector} in {selected_country} vs Global")
 
-    country_sec, global_sec = compare_sector_with_global(df, selected_country, selected_sector, selected_year)
+    country_sec, global_sec = compare_sector_with_global(cube, selected_country, selected_sector, selected_year)
     delta_sec = country_sec - global_sec
     delta_sec_pct = (delta_sec / global_sec) * 100
 
@@ -14,17 +14,14 @@ if SCRIPTS_DIR not in sys.path:
 
 # --- Import Data Functions ---
 from global_indicators import (
-    load_zonal_temperature_data,
-    load_global_temperature_data,
     get_global_annual_trend,
     get_zonal_trend_summary,
     get_temperature_rate_of_change,
     get_warming_rate_by_zone,
-    load_sea_level_data,
     summarize_sea_level_trend,
     get_sea_level_trend_line,
-    load_gas_data
 )
+from dataset_registry import get_dataset, get_datasets
 
 # --- Page Configuration ---
 st.set_page_config(page_title="🌍 Climenro - Global Climate Indicators", layout="wide")
@@ -36,8 +33,7 @@ st.sidebar.header("📁 Data Sources")
 st.sidebar.markdown("**Temperature:** NASA GISTEMP\n\n**Sea Level:** GRACE/GRACE-FO")
 
 # --- Load Data ---
-global_df = load_global_temperature_data()
-zonal_df = load_zonal_temperature_data()
+global_df, zonal_df = get_datasets("gistemp_global", "gistemp_zonal")
 
 # --- Tabs Setup ---
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
@@ -159,7 +155,7 @@ with tab5:
 with tab6:
     st.subheader("🌊 Global Sea Level Rise (GRACE/GRACE-FO)")
     try:
-        sea_df = load_sea_level_data()
+        sea_df = get_dataset("sea_level")
         sea_summary = summarize_sea_level_trend(sea_df)
         st.markdown(f"**Rate:** `{sea_summary['rate_mm_per_year']:.2f} mm/year`  ")
         st.markdown(f"**Total Rise:** `{sea_summary['total_rise_mm']:.2f} mm`  ")
@@ -174,10 +170,9 @@ with tab6:
         st.exception(e)
 
 # Load gas datasets
-co2_df = load_gas_data("co2_mm_gl.csv")
-ch4_df = load_gas_data("ch4_mm_gl.csv")
-n2o_df = load_gas_data("n2o_mm_gl.csv")
-sf6_df = load_gas_data("sf6_mm_gl.csv")
+co2_df, ch4_df, n2o_df, sf6_df = get_datasets(
+    "co2_concentration", "ch4_concentration", "n2o_concentration", "sf6_concentration"
+)
 
 # Display in tabs
 with tab7:
@@ -10,7 +10,7 @@ scripts_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "scripts"))
 if scripts_dir not in sys.path:
     sys.path.append(scripts_dir)
 
-from load_edgar import load_edgar_ipcc2006
+from dataset_registry import get_dataset
 from warming_loader import load_region_temp
 from climate_change import compute_rolling_average, compute_lag_correlation
 
@@ -51,11 +51,7 @@ st.markdown("<hr class='thin-line'/>", unsafe_allow_html=True)
 # -------------------------------
 # Load Data
 # -------------------------------
-@st.cache_data
-def load_data():
-    return load_edgar_ipcc2006()
-
-edgar_df = load_data()
+edgar_df = get_dataset("edgar_ghg")
 
 # Load and preprocess temperature data
 try:
@@ -18,7 +18,7 @@ from owid_functions import *
 
 @st.cache_data
 def load_owid():
-    return pd.read_csv("data/owid-energy-data.csv")
+    return load_owid_data(RENEWABLE_COLUMNS)
 
 # ...rest of the script
 df = load_owid()
@@ -15,14 +15,15 @@ if root_dir not in sys.path:
 
 # Load functions
 from renewable_vs_emission import *
-from load_edgar import load_edgar_ipcc2006
+from dataset_registry import get_dataset
+from owid_functions import load_owid_data, RENEWABLE_COLUMNS
 
 @st.cache_data
 def load_energy_data():
-    return pd.read_csv("data/owid-energy-data.csv")
+    return load_owid_data(RENEWABLE_COLUMNS)
 
 # Load data
-df_emission = load_edgar_ipcc2006()
+df_emission = get_dataset("edgar_ghg")
 df_renew = load_energy_data()
 
 # -----------------------------
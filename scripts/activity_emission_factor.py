@@ -1,42 +1,69 @@
+import os
+import weakref
+import numpy as np
 import pandas as pd
-import re
+from concurrent.futures import ProcessPoolExecutor
+
+from keyword_matcher import KeywordMatcher, matcher_for
+from emission_units import parse_co2e_impact
 
 def load_activity_table(path='data/activity_emission_factor.csv'):
     df = pd.read_csv(path, encoding='utf-8')
     df['Keywords'] = df['Keywords'].fillna('').apply(
         lambda x: [kw.strip().lower() for kw in x.split(',')]
     )
-    return df
+    return add_numeric_columns(df)
+
+def add_numeric_columns(df_activity):
+    """
+    Pre-parse the per-activity numbers used by the estimators: impact per
+    unit, unit cost, displacement flag and lower-cased input type.
+    """
+    df_activity['impact_per_unit'] = df_activity['CO₂e Impact'].map(parse_impact_to_float).astype(float)
+    df_activity['unit_cost'] = pd.to_numeric(df_activity['Default Unit Cost'], errors='coerce')
+    df_activity['uses_displacement'] = df_activity['Uses Displacement'].map(bool)
+    df_activity['input_type'] = df_activity['Required Input Type'].map(
+        lambda x: x.strip().lower() if isinstance(x, str) else x
+    )
+    return df_activity
 
 def load_country_factors(path='data/country_composite_factor.csv'):
     df = pd.read_csv(path, encoding='utf-8')
     df['Country'] = df['Country'].str.strip()
     return df
 
+_country_lookups = {}
+
+def country_lookup(df_country):
+    """Lower-cased country name -> row position (first occurrence), built once per table."""
+    key = id(df_country)
+    if key not in _country_lookups:
+        names = df_country['Country'].str.lower()
+        _country_lookups[key] = {name: pos for pos, name in reversed(list(enumerate(names)))}
+        weakref.finalize(df_country, _country_lookups.pop, key, None)
+    return _country_lookups[key]
+
+def _country_position(country_name, df_country):
+    return country_lookup(df_country).get(country_name.lower())
+
 def get_displacement_ratio(country_name, df_country):
-    row = df_country[df_country['Country'].str.lower() == country_name.lower()]
-    if not row.empty:
-        return float(row.iloc[0]['Displacement Ratio'])
+    pos = _country_position(country_name, df_country)
+    if pos is not None:
+        return float(df_country.iloc[pos]['Displacement Ratio'])
     return None  # Or raise warning
 
 
 def classify_policy(policy_text, df_activity):
-    policy_text = policy_text.lower()
-    match_scores = []
-
-    for idx, row in df_activity.iterrows():
-        score = sum(1 for kw in row['Keywords'] if kw in policy_text)
-        match_scores.append(score)
-
-    best_idx = pd.Series(match_scores).idxmax()
+    best_pos, _, keywords_matched = matcher_for(df_activity).best_match(policy_text.lower())
 
-    if match_scores[best_idx] == 0:
+    if best_pos is None:
         return {"matched": False, "activity_class": None}
 
+    best_idx = df_activity.index[best_pos]
     return {
         "matched": True,
         "activity_class": df_activity.loc[best_idx, 'Activity Class'],
-        "keywords_matched": [kw for kw in df_activity.loc[best_idx, 'Keywords'] if kw in policy_text],
+        "keywords_matched": keywords_matched,
         "emission_per_unit": df_activity.loc[best_idx, 'CO₂e Impact'],
         "unit": df_activity.loc[best_idx, 'Unit'],
         "instrument_type": df_activity.loc[best_idx, 'Instrument Type'],
@@ -44,6 +71,103 @@ def classify_policy(policy_text, df_activity):
     }
 
 
+# Activity columns copied into batch results, as named in classify_policy's result
+RESULT_COLUMNS = {
+    'Activity Class': 'activity_class',
+    'CO₂e Impact': 'emission_per_unit',
+    'Unit': 'unit',
+    'Instrument Type': 'instrument_type',
+    'Sector': 'sector',
+}
+
+_worker_matcher = None
+
+
+def _init_classify_worker(keyword_lists):
+    global _worker_matcher
+    _worker_matcher = KeywordMatcher(keyword_lists)
+
+
+def _match_chunk(texts):
+    return _worker_matcher.best_matches(texts)
+
+
+def _iter_classified_chunks(texts, df_activity, chunk_size, max_workers):
+    texts = ["" if pd.isna(t) else str(t) for t in texts]
+    lowered = [t.lower() for t in texts]
+    chunks = [(start, lowered[start:start + chunk_size]) for start in range(0, len(lowered), chunk_size)]
+
+    if len(chunks) > 1 and max_workers != 1:
+        # Workers compile their own matcher once; chunks come back in input order
+        keyword_lists = [list(kws) for kws in df_activity['Keywords']]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_classify_worker,
+                                 initargs=(keyword_lists,)) as executor:
+            matches = executor.map(_match_chunk, [chunk for _, chunk in chunks])
+            for (start, chunk), match in zip(chunks, matches):
+                yield _chunk_frame(texts[start:start + len(chunk)], match, df_activity)
+    else:
+        matcher = matcher_for(df_activity)
+        for start, chunk in chunks:
+            yield _chunk_frame(texts[start:start + len(chunk)], matcher.best_matches(chunk), df_activity)
+
+
+def _chunk_frame(texts, match, df_activity):
+    best, scores, keywords_matched = match
+    matched = best >= 0
+    result = pd.DataFrame({"text": texts, "matched": matched, "score": scores,
+                           "keywords_matched": keywords_matched})
+    rows = df_activity.iloc[best[matched]]
+    for column, name in RESULT_COLUMNS.items():
+        values = np.full(len(result), None, dtype=object)
+        values[matched] = rows[column].to_numpy()
+        result[name] = pd.Series(values, index=result.index, dtype=object)
+    return result
+
+
+def classify_policies(texts, df_activity, chunk_size=5000, max_workers=None):
+    """
+    Classify many policy texts at once. Returns one row per text with the
+    fields of classify_policy (activity_class is None when nothing matched)
+    plus the match score. Inputs larger than `chunk_size` are scored in
+    chunks across a process pool; pass max_workers=1 to stay in-process.
+    """
+    frames = list(_iter_classified_chunks(texts, df_activity, chunk_size, max_workers))
+    if not frames:
+        return _chunk_frame([], matcher_for(df_activity).best_matches([]), df_activity)
+    return pd.concat(frames, ignore_index=True)
+
+
+def classify_policies_to_file(texts, df_activity, output_path, chunk_size=5000, max_workers=None):
+    """
+    Like classify_policies, but writes each chunk to `output_path` (.csv or
+    .parquet) as soon as it is scored, so memory stays flat for very large
+    inputs. Returns the number of rows written.
+    """
+    is_parquet = os.path.splitext(output_path)[1].lower() == '.parquet'
+    writer = None
+    written = 0
+    try:
+        for frame in _iter_classified_chunks(texts, df_activity, chunk_size, max_workers):
+            if is_parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                # Fixed schema so chunks with no matches still line up
+                schema = pa.schema([("text", pa.string()), ("matched", pa.bool_()), ("score", pa.int64()),
+                                    ("keywords_matched", pa.list_(pa.string()))]
+                                   + [(name, pa.string()) for name in RESULT_COLUMNS.values()])
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, schema)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+            else:
+                frame = frame.assign(keywords_matched=frame['keywords_matched'].str.join(', '))
+                frame.to_csv(output_path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+            written += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
 def estimate_emission_impact(policy_result, budget, subsidy_per_unit, displacement_ratio):
     try:
         # Parse emission value from policy_result['emission_per_unit'] like '–1.6 tons'
@@ -55,10 +179,7 @@ def estimate_emission_impact(policy_result, budget, subsidy_per_unit, displaceme
         return None
 
 def parse_emission_value(emission_str):
-    try:
-        return float(emission_str.replace('–', '-').replace(',', '').split()[0])
-    except Exception:
-        return None
+    return parse_co2e_impact(emission_str)
 
 def get_required_input_type(activity_row):
     if isinstance(activity_row, pd.Series):
@@ -82,7 +203,10 @@ def estimate_units(policy_row, user_input, country_row=None):
         return user_input
 
 def estimate_emission_impact(policy_row, user_input, country_row=None):
-    emission_per_unit = parse_impact_to_float(policy_row.get('CO₂e Impact', ''))
+    if 'impact_per_unit' in policy_row:
+        emission_per_unit = policy_row['impact_per_unit']
+    else:
+        emission_per_unit = parse_impact_to_float(policy_row.get('CO₂e Impact', ''))
     if emission_per_unit is None:
         return None
 
@@ -163,16 +287,45 @@ def sector_to_influencer(sector):
     return mapping.get(sector, "General Influencers")
 
 def get_efficiency_score(country, df_country):
-    row = df_country[df_country['Country'].str.lower() == country.lower()]
-    if not row.empty:
-        return float(row.iloc[0]['Efficiency'])
+    pos = _country_position(country, df_country)
+    if pos is not None:
+        return float(df_country.iloc[pos]['Efficiency'])
     return 0.5
 
+def estimate_portfolio_impacts(activities, countries, inputs, df_activity, df_country):
+    """
+    Vectorised estimate_emission_impact for many (activity class, country,
+    input) combinations at once. Returns a float array, NaN wherever the
+    single-row estimator would return None or the activity is unknown.
+    Needs a table from load_activity_table (pre-parsed numeric columns).
+    """
+    activities = np.asarray(activities, dtype=object)
+    inputs = np.asarray(inputs, dtype=float)
+
+    # First row per activity class, as in get_activity_row
+    activity_pos = pd.Series(np.arange(len(df_activity)), index=df_activity['Activity Class'])
+    activity_pos = activity_pos[~activity_pos.index.duplicated()]
+    a_pos = activity_pos.reindex(activities).to_numpy(dtype=float)
+    known = ~np.isnan(a_pos)
+    a_pos = np.where(known, a_pos, 0).astype(int)
+
+    lookup = country_lookup(df_country)
+    c_pos = np.array([lookup.get(str(c).lower(), -1) for c in countries], dtype=int)
+    ratios = df_country['Displacement Ratio'].to_numpy(dtype=float)
+    country_ratio = np.where(c_pos >= 0, ratios[np.maximum(c_pos, 0)], 1.0)
+
+    impact = df_activity['impact_per_unit'].to_numpy(dtype=float)[a_pos]
+    unit_cost = df_activity['unit_cost'].to_numpy(dtype=float)[a_pos]
+    uses_displacement = df_activity['uses_displacement'].to_numpy(dtype=bool)[a_pos]
+    is_budget = (df_activity['input_type'] == 'budget').to_numpy()[a_pos]
+
+    ratio = np.where(uses_displacement & (c_pos >= 0), country_ratio, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        budget_units = np.where(np.isnan(unit_cost) | (unit_cost == 0), np.nan, inputs / unit_cost * ratio)
+    units = np.where(is_budget, budget_units, inputs)
+    return np.where(known, np.round(units * impact, 2), np.nan)
+
 def parse_impact_to_float(impact_str):
-    try:
-        # Replace en-dash with minus, remove commas and units
-        clean = impact_str.replace("–", "-").replace(",", "")
-        number_part = re.findall(r"-?\d+\.?\d*", clean)
-        return float(number_part[0]) if number_part else 0.0
-    except Exception:
-        return 0.0
+    # Tonnes CO₂e per unit; 0.0 when the string has no number
+    value = parse_co2e_impact(impact_str)
+    return 0.0 if value is None else value
@@ -0,0 +1,271 @@
+"""
+Offline data build.
+
+Runs every dataset loader once, validates the cleaned frames and writes
+them as a versioned Parquet bundle under data/processed/, together with a
+manifest of source and output SHA-256 hashes. Datasets whose sources are
+unchanged since the last build are skipped. The app reads a bundled frame
+only while its sources still match the manifest signature (path, size,
+mtime); after a source update it parses the source until the next build.
+
+Exempt from the bundle (still parsed at runtime, one cache each):
+    - carbon prices and inflation: CarbonPriceAnalyzer keeps its own
+      Parquet frame cache under data/processed/cache
+    - OWID energy: owid_functions.load_owid_data reads only the columns a
+      page needs, once per process
+    - EIA generation: read only by generate_energy_macc, not by the pages
+
+Derived files read directly by the app (data/policy_vectors.csv and the
+policy projection model) are rebuilt here too, again only when their
+source hash changes.
+
+Usage:
+    python scripts/build_data.py [--force] [dataset ...]
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+from datetime import datetime, timezone
+
+from frame_cache import BASE_DIR
+from data_bundle import BUNDLE_VERSION, BUNDLE_DIR, MANIFEST_PATH, bundle_file, bundle_signature, load_manifest
+from load_edgar import (
+    load_edgar_ipcc2006,
+    load_edgar_co2,
+    load_edgar_co2bio,
+    load_edgar_ch4,
+    load_edgar_n2o,
+    load_population,
+    load_gdp,
+)
+from policy_vectorizer import GEN_INFO_PATH, POLICY_VECTORS_PATH, write_policy_vectors
+from vector_analysis import PROJECTION_MODEL_PATH, write_projection_model
+
+logger = logging.getLogger(__name__)
+
+EDGAR_COLUMNS = ["Country_code_A3", "ipcc_code_2006_for_standard_report_name",
+                 "Substance", "fossil_bio", "year", "emissions_mtco2e"]
+
+
+def _data(*parts):
+    return os.path.join(BASE_DIR, "data", *parts)
+
+
+def _load_gain():
+    from resilience_index import load_gain_data
+    return load_gain_data(_data("nd_gain", "gain.csv"))
+
+
+def _load_sector_vulnerability():
+    from sector_vulnerability import load_sector_vulnerability_data
+    return load_sector_vulnerability_data()
+
+
+def _load_gistemp(loader_name):
+    def load():
+        import global_indicators
+        return getattr(global_indicators, loader_name)()
+    return load
+
+
+def _load_gas(filename):
+    def load():
+        from global_indicators import load_gas_data
+        return load_gas_data(filename)
+    return load
+
+
+def _vulnerability_sources():
+    from sector_vulnerability import SECTOR_FILES
+    return [_data("nd_gain", "vulnerability", f) for f in SECTOR_FILES.values()]
+
+
+# name -> (source files, loader, required columns); see the module docstring
+# for the sources deliberately left out
+DATASETS = {
+    "edgar_ghg": ([_data("EDGAR_AR5_GHG_1970_2023.xlsx")],
+                  lambda: load_edgar_ipcc2006(_data("EDGAR_AR5_GHG_1970_2023.xlsx")), EDGAR_COLUMNS),
+    "edgar_co2": ([_data("EDGAR_CO2_1970_2023.xlsx")],
+                  lambda: load_edgar_co2(_data("EDGAR_CO2_1970_2023.xlsx")), EDGAR_COLUMNS),
+    "edgar_co2bio": ([_data("EDGAR_CO2bio_1970_2023.xlsx")],
+                     lambda: load_edgar_co2bio(_data("EDGAR_CO2bio_1970_2023.xlsx")), EDGAR_COLUMNS),
+    "edgar_ch4": ([_data("EDGAR_CH4_1970_2023.xlsx")],
+                  lambda: load_edgar_ch4(_data("EDGAR_CH4_1970_2023.xlsx")), EDGAR_COLUMNS),
+    "edgar_n2o": ([_data("EDGAR_N2O_1970_2023.xlsx")],
+                  lambda: load_edgar_n2o(_data("EDGAR_N2O_1970_2023.xlsx")), EDGAR_COLUMNS),
+    "population": ([_data("total_population_un.csv")],
+                   lambda: load_population(_data("total_population_un.csv")),
+                   ["Country_code_A3", "year", "population"]),
+    "gdp": ([_data("imf_gdp_current_prices.csv")],
+            lambda: load_gdp(_data("imf_gdp_current_prices.csv")),
+            ["Country", "year", "gdp_billion_usd"]),
+    "nd_gain": ([_data("nd_gain", "gain.csv")], _load_gain, ["ISO3", "Name", "year", "gain_index"]),
+    "sector_vulnerability": (_vulnerability_sources, _load_sector_vulnerability,
+                             ["ISO3", "Name", "year", "score", "sector"]),
+    "gistemp_global": ([_data("gistemp", "Global_annual_means.csv")],
+                       _load_gistemp("load_global_temperature_data"), ["Year"]),
+    "gistemp_zonal": ([_data("gistemp", "Zonal_annual_means.csv")],
+                      _load_gistemp("load_zonal_temperature_data"), ["Year", "Glob"]),
+    "sea_level": ([_data("gistemp", "GRACE_GOMA.nc")],
+                  _load_gistemp("load_sea_level_data"), ["time", "sea_level_anomaly"]),
+    "co2_concentration": ([_data("co2_mm_gl.csv")], _load_gas("co2_mm_gl.csv"), ["datetime", "average"]),
+    "ch4_concentration": ([_data("ch4_mm_gl.csv")], _load_gas("ch4_mm_gl.csv"), ["datetime", "average"]),
+    "n2o_concentration": ([_data("n2o_mm_gl.csv")], _load_gas("n2o_mm_gl.csv"), ["datetime", "average"]),
+    "sf6_concentration": ([_data("sf6_mm_gl.csv")], _load_gas("sf6_mm_gl.csv"), ["datetime", "average"]),
+}
+
+# Derived files: name -> (sources, writer(*sources, output), output), built in order
+DERIVED = {
+    "policy_vectors": ([GEN_INFO_PATH], write_policy_vectors, POLICY_VECTORS_PATH),
+    "policy_projection": ([POLICY_VECTORS_PATH], write_projection_model, PROJECTION_MODEL_PATH),
+}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def validate_frame(name, df, required_columns):
+    """Raise ValueError if a built frame is empty or misses required data."""
+    if df is None or df.empty:
+        raise ValueError(f"{name}: loader returned no rows")
+    missing = [col for col in required_columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"{name}: missing columns {missing}")
+    empty = [col for col in required_columns if df[col].isna().all()]
+    if empty:
+        raise ValueError(f"{name}: columns with no values {empty}")
+
+
+def _write_frame(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, path)
+
+
+def _write_manifest(manifest):
+    tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def build(names=None, force=False):
+    """
+    Build the bundle for `names` (all datasets by default). Returns a dict of
+    dataset -> "built", "unchanged", "missing sources" or the error message.
+    """
+    names = names or list(DATASETS)
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        raise KeyError(f"Unknown datasets: {unknown}")
+
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    manifest = load_manifest()
+    status = {}
+
+    for name in names:
+        sources, loader, required = DATASETS[name]
+        if callable(sources):
+            sources = sources()
+        missing = [path for path in sources if not os.path.exists(path)]
+        if missing:
+            logger.warning("Skipping %s: missing %s", name, missing)
+            status[name] = "missing sources"
+            continue
+
+        source_hashes = {os.path.relpath(path, BASE_DIR): file_sha256(path) for path in sources}
+        entry = manifest["datasets"].get(name)
+        if (not force and entry and entry["sources"] == source_hashes
+                and os.path.exists(bundle_file(name))):
+            # Same content, possibly a new mtime (e.g. a fresh checkout): refresh
+            # the signature so the app keeps reading the bundle
+            signature = bundle_signature(source_hashes)
+            if entry.get("signature") != signature:
+                entry["signature"] = signature
+                _write_manifest(manifest)
+            status[name] = "unchanged"
+            continue
+
+        started = time.perf_counter()
+        try:
+            df = loader()
+            validate_frame(name, df, required)
+            _write_frame(df, bundle_file(name))
+        except Exception as e:
+            logger.error("Failed to build %s: %s", name, e)
+            status[name] = str(e)
+            continue
+
+        manifest["datasets"][name] = {
+            "file": os.path.relpath(bundle_file(name), BASE_DIR),
+            "sha256": file_sha256(bundle_file(name)),
+            "sources": source_hashes,
+            "signature": bundle_signature(source_hashes),
+            "rows": len(df),
+            "columns": [str(col) for col in df.columns],
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        # Persist after every dataset so an interrupted build keeps its progress
+        manifest["version"] = BUNDLE_VERSION
+        _write_manifest(manifest)
+        logger.info("Built %s (%d rows) in %.2fs", name, len(df), time.perf_counter() - started)
+        status[name] = "built"
+
+    return status
+
+
+def build_derived(force=False):
+    """
+    Rewrite each derived file whose sources changed since the last build.
+    Returns a dict of output -> "built", "unchanged" or the error message.
+    """
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    manifest = load_manifest()
+    manifest.setdefault("derived", {})
+    status = {}
+    for name, (sources, writer, output) in DERIVED.items():
+        source_hashes = {os.path.relpath(path, BASE_DIR): file_sha256(path) for path in sources}
+        entry = manifest["derived"].get(name)
+        if not force and entry and entry["sources"] == source_hashes and os.path.exists(output):
+            status[name] = "unchanged"
+            continue
+        try:
+            rows = writer(*sources, output)
+        except Exception as e:
+            logger.error("Failed to build %s: %s", name, e)
+            status[name] = str(e)
+            continue
+        manifest["derived"][name] = {
+            "file": os.path.relpath(output, BASE_DIR),
+            "sources": source_hashes,
+            "rows": rows,
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        manifest["version"] = BUNDLE_VERSION
+        _write_manifest(manifest)
+        status[name] = "built"
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the preprocessed data bundle.")
+    parser.add_argument("datasets", nargs="*", help="datasets to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if sources are unchanged")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = build(args.datasets, force=args.force)
+    if not args.datasets:
+        results.update(build_derived(force=args.force))
+    for name, result in results.items():
+        print(f"{name:24s} {result}")
+    sys.exit(0 if all(r in ("built", "unchanged", "missing sources") for r in results.values()) else 1)
@@ -3,11 +3,50 @@ import numpy as np
 import plotly.graph_objects as go
 import re
 
+from frame_cache import cached_frame
+
 class CarbonPriceAnalyzer:
-    def __init__(self, carbon_price_path, inflation_path):
-        self.carbon_data = self._load_carbon_data(carbon_price_path)
-        self.inflation_data = self._load_inflation_data(inflation_path)
-        
+    """
+    Carbon price and inflation series by country. Both frames are sorted by
+    country (rows within a country keep their source order) and indexed as
+    country -> row range, so per-country lookups are slices, not filters.
+    The cleaned frames are cached in columnar form, keyed by source mtime.
+    """
+
+    def __init__(self, carbon_price_path, inflation_path, use_cache=True):
+        if use_cache:
+            self.carbon_data = cached_frame("carbon_price_by_country", carbon_price_path,
+                                            lambda: self._sort_by_country(self._load_carbon_data(carbon_price_path)))
+            self.inflation_data = cached_frame("inflation_by_country", inflation_path,
+                                               lambda: self._sort_by_country(self._load_inflation_data(inflation_path)))
+        else:
+            self.carbon_data = self._sort_by_country(self._load_carbon_data(carbon_price_path))
+            self.inflation_data = self._sort_by_country(self._load_inflation_data(inflation_path))
+        self._carbon_index = self._build_index(self.carbon_data)
+        self._inflation_index = self._build_index(self.inflation_data)
+
+    @staticmethod
+    def _sort_by_country(df):
+        return df.sort_values("country", kind="stable", na_position="last").reset_index(drop=True)
+
+    @staticmethod
+    def _build_index(df):
+        # country -> (start, stop) rows; rows without a country sort last and are left out
+        countries = df["country"].to_numpy()[df["country"].notna().to_numpy()]
+        if not len(countries):
+            return {}
+        change = np.flatnonzero(countries[1:] != countries[:-1]) + 1
+        starts = np.r_[0, change]
+        stops = np.r_[change, len(countries)]
+        return {countries[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+    @staticmethod
+    def _rows(df, index, countries):
+        positions = [np.arange(*index[country]) for country in countries if country in index]
+        if not positions:
+            return df.iloc[0:0]
+        return df.iloc[np.concatenate(positions)]
+
     def _load_carbon_data(self, filepath):
         """Load and clean World Bank carbon pricing data."""
         # Load both relevant sheets
@@ -83,18 +122,20 @@ class CarbonPriceAnalyzer:
 
     def get_available_countries(self):
         """Return list of countries for which carbon pricing data is available."""
-        return sorted(self.carbon_data["country"].dropna().unique())
+        return sorted(self._carbon_index)
 
     def get_country_data(self, country):
         """Get both carbon price and inflation data for a specific country."""
-        carbon_df = self.carbon_data[self.carbon_data["country"] == country]
-        inflation_df = self.inflation_data[self.inflation_data["country"] == country]
-        return carbon_df, inflation_df
+        return self.get_many([country])
+
+    def get_many(self, countries):
+        """Carbon price and inflation rows for several countries, in the order given."""
+        return (self._rows(self.carbon_data, self._carbon_index, countries),
+                self._rows(self.inflation_data, self._inflation_index, countries))
 
     def generate_price_plot(self, carbon_df):
         fig = go.Figure()
-        for initiative in carbon_df["initiative"].unique():
-            subset = carbon_df[carbon_df["initiative"] == initiative]
+        for initiative, subset in carbon_df.groupby("initiative", sort=False):
             fig.add_trace(go.Scatter(
                 x=subset["year"],
                 y=subset["price_usd"],
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 
+from owid_functions import load_owid_data, GDP_COLUMNS
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
 
 def load_life_expectancy_data():
@@ -33,9 +35,7 @@ def load_pm25_data():
 
 
 def load_gdp_data():
-    path = os.path.join(BASE_DIR, "owid-energy-data.csv")
-    df = pd.read_csv(path)
-    
+    df = load_owid_data(GDP_COLUMNS)
     df = df.rename(columns={"country": "country", "year": "year"})
     df = df[["country", "year", "gdp"]]
     df = df.dropna(subset=["gdp"])
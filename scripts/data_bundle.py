@@ -0,0 +1,59 @@
+import os
+import json
+
+from frame_cache import BASE_DIR, read_cached_frame, source_signature
+
+# Prebuilt dataset bundle written by scripts/build_data.py. The app reads
+# cleaned frames from here (memory-mapped Parquet) and only falls back to
+# parsing the raw sources when a dataset has not been built.
+BUNDLE_VERSION = 1
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+BUNDLE_DIR = os.path.join(PROCESSED_DIR, "bundle", f"v{BUNDLE_VERSION}")
+MANIFEST_PATH = os.path.join(PROCESSED_DIR, "manifest.json")
+
+
+def load_manifest():
+    """Return the bundle manifest, or an empty one if nothing has been built."""
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": BUNDLE_VERSION, "datasets": {}}
+    if manifest.get("version") != BUNDLE_VERSION:
+        return {"version": BUNDLE_VERSION, "datasets": {}}
+    return manifest
+
+
+def bundle_file(name):
+    return os.path.join(BUNDLE_DIR, f"{name}.parquet")
+
+
+def bundle_signature(sources):
+    """Path/size/mtime signature of a dataset's sources, as recorded in the manifest."""
+    return source_signature(*(os.path.join(BASE_DIR, path) for path in sorted(sources)))
+
+
+def read_bundle(name):
+    """
+    Memory-map a bundled dataset, or return None if it is not in the bundle
+    or its sources changed since it was built (the caller then parses them).
+    """
+    entry = load_manifest()["datasets"].get(name)
+    if entry is None:
+        return None
+    try:
+        stale = bundle_signature(entry["sources"]) != entry.get("signature")
+    except OSError:
+        # Sources not shipped with this deployment: the bundle is all there is
+        stale = False
+    if stale:
+        return None
+    return read_cached_frame(bundle_file(name))
+
+
+def bundled(name, loader):
+    """Wrap `loader` so it reads the bundled copy of `name` when one exists."""
+    def load():
+        df = read_bundle(name)
+        return loader() if df is None else df
+    return load
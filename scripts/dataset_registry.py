@@ -0,0 +1,136 @@
+import threading
+
+from load_edgar import load_population, load_gdp
+from emissions_store import EmissionsStore, GAS_LOADERS
+from parallel_loader import load_parallel
+from data_bundle import bundled, read_bundle
+
+# Process-wide registry of shared datasets. Every page and script pulls from
+# here, so each dataset is loaded once per process and every caller gets the
+# same instance (no per-hit copy as with st.cache_data).
+#
+# Returned objects are shared: treat them as read-only. Filtering, merging
+# and groupby all return new objects; never assign columns or use
+# inplace=True on a registry dataset — take a .copy() first.
+#
+# Built-in datasets come from the prebuilt bundle (scripts/build_data.py)
+# when it exists and are parsed from the raw sources otherwise.
+
+_LOADERS = {}
+_DEPENDENTS = {}
+_INSTANCES = {}
+_LOCKS = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_dataset(name, loader, depends_on=()):
+    """
+    Register a zero-argument `loader` under `name`. Datasets derived from
+    others list them in `depends_on` so invalidation cascades.
+    """
+    with _REGISTRY_LOCK:
+        _LOADERS[name] = loader
+        _LOCKS.setdefault(name, threading.Lock())
+        for parent in depends_on:
+            _DEPENDENTS.setdefault(parent, set()).add(name)
+        _INSTANCES.pop(name, None)
+
+
+def get_dataset(name):
+    """Return the shared instance of a dataset, loading it on first use."""
+    if name in _INSTANCES:
+        return _INSTANCES[name]
+    if name not in _LOADERS:
+        raise KeyError(f"Unknown dataset: {name}")
+
+    # Per-dataset lock: concurrent sessions wait for one load instead of racing
+    with _LOCKS[name]:
+        if name not in _INSTANCES:
+            _INSTANCES[name] = _LOADERS[name]()
+    return _INSTANCES[name]
+
+
+def get_datasets(*names):
+    """Return several datasets as a tuple, loading the missing ones concurrently."""
+    missing = [name for name in dict.fromkeys(names) if name not in _INSTANCES]
+    if len(missing) > 1:
+        load_parallel([(name, lambda name=name: get_dataset(name)) for name in missing])
+    return tuple(get_dataset(name) for name in names)
+
+
+def invalidate(name=None):
+    """Drop a loaded dataset (and anything derived from it), or all of them."""
+    with _REGISTRY_LOCK:
+        if name is None:
+            _INSTANCES.clear()
+            return
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            _INSTANCES.pop(current, None)
+            pending.extend(_DEPENDENTS.get(current, ()))
+
+
+def is_loaded(name):
+    return name in _INSTANCES
+
+
+# --- Built-in datasets ---
+def _load_emissions_store():
+    frames = {gas: read_bundle(f"edgar_{gas}") for gas in GAS_LOADERS}
+    if all(df is not None for df in frames.values()):
+        return EmissionsStore.from_frames(frames)
+    return EmissionsStore.load()
+
+
+def _load_edgar_ghg():
+    # The GHG rows of the shared store (compact dtypes, read-only), so the
+    # frame is held once rather than again with object dtypes
+    return get_dataset("emissions_store").frame("ghg").drop(columns="gas")
+
+
+def _load_global_indicator(loader_name, *args):
+    # Imported lazily: global_indicators pulls in xarray, only needed on one page
+    def load():
+        import global_indicators
+        return getattr(global_indicators, loader_name)(*args)
+    return load
+
+
+def _load_gain():
+    from resilience_index import load_gain_data
+    return load_gain_data()
+
+
+def _load_sector_vulnerability():
+    from sector_vulnerability import load_sector_vulnerability_data
+    return load_sector_vulnerability_data()
+
+
+def _load_emission_baselines():
+    from emission_baselines import compute_baselines
+    return compute_baselines(get_dataset("edgar_ghg_cube"))
+
+
+def _load_country_codes():
+    from emission_baselines import country_code_lookup
+    return country_code_lookup(*get_datasets("edgar_ghg", "population"))
+
+
+register_dataset("emissions_store", _load_emissions_store)
+register_dataset("edgar_ghg", _load_edgar_ghg, depends_on=["emissions_store"])
+# The store's own GHG cube, shared with pages that use store.cube("ghg")
+register_dataset("edgar_ghg_cube", lambda: get_dataset("emissions_store").cube("ghg"),
+                 depends_on=["emissions_store"])
+register_dataset("emission_baselines", _load_emission_baselines, depends_on=["edgar_ghg_cube"])
+register_dataset("population", bundled("population", load_population))
+register_dataset("gdp", bundled("gdp", load_gdp))
+register_dataset("country_codes", _load_country_codes, depends_on=["edgar_ghg", "population"])
+register_dataset("nd_gain", bundled("nd_gain", _load_gain))
+register_dataset("sector_vulnerability", bundled("sector_vulnerability", _load_sector_vulnerability))
+register_dataset("gistemp_global", bundled("gistemp_global", _load_global_indicator("load_global_temperature_data")))
+register_dataset("gistemp_zonal", bundled("gistemp_zonal", _load_global_indicator("load_zonal_temperature_data")))
+register_dataset("sea_level", bundled("sea_level", _load_global_indicator("load_sea_level_data")))
+for _gas in ("co2", "ch4", "n2o", "sf6"):
+    register_dataset(f"{_gas}_concentration",
+                     bundled(f"{_gas}_concentration", _load_global_indicator("load_gas_data", f"{_gas}_mm_gl.csv")))
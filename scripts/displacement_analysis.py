@@ -1,5 +1,8 @@
 import pandas as pd
 
+FOSSIL_COLUMNS = ["coal_consumption", "oil_consumption", "gas_consumption"]
+RENEWABLE_COLUMNS = ["solar_consumption", "wind_consumption", "hydro_consumption", "biofuel_consumption"]
+
 # 1. Compare fossil and renewable energy over time for a country
 def fossil_vs_renewable_energy(df, iso_code):
     df_country = df[df["iso_code"] == iso_code].copy()
@@ -35,33 +38,37 @@ def displacement_score(df, iso_code):
 
 
 def compare_displacement_scores(df, latest_only=True):
-    scores = []
-    countries = df["iso_code"].dropna().unique()
-
-    for code in countries:
-        growth_df = energy_growth_rates(df, code)
-        if growth_df is None or growth_df.empty:
-            continue
-
-        # Calculate displacement score: renewable - fossil
-        growth_df["displacement_score"] = growth_df["renewable_growth"] - growth_df["fossil_growth"]
-
-        growth_df["country"] = df[df["iso_code"] == code]["country"].iloc[0]
-
-        if latest_only:
-            last = growth_df.sort_values("year", ascending=False).head(1)
-            scores.append(last[["year", "country", "displacement_score"]])
-        else:
-            scores.append(growth_df[["year", "country", "displacement_score"]])
-
-    return pd.concat(scores, ignore_index=True)
+    """
+    Displacement score (renewable growth - fossil growth) for every country,
+    computed over the whole panel in one groupby pass. Countries keep their
+    order of first appearance in `df`; `latest_only` keeps each country's
+    most recent year.
+    """
+    panel = df[df["iso_code"].notna() & df["year"].notna()]
+    panel = _prepare_energy_columns(panel[["iso_code", "year"] + FOSSIL_COLUMNS + RENEWABLE_COLUMNS])
+    panel["country_order"] = pd.factorize(panel["iso_code"].to_numpy())[0]
+    panel = panel.sort_values(["country_order", "year"], kind="stable")
+
+    by_country = panel.groupby("country_order", sort=False)
+    panel["fossil_growth"] = by_country["fossil_energy"].pct_change() * 100
+    panel["renewable_growth"] = by_country["renewables_energy"].pct_change() * 100
+    panel = panel.dropna(subset=["fossil_growth", "renewable_growth"])
+    panel["displacement_score"] = panel["renewable_growth"] - panel["fossil_growth"]
+
+    # Country name from each code's first row, as in the original frame
+    names = df[df["iso_code"].notna()].drop_duplicates("iso_code").set_index("iso_code")["country"]
+    panel["country"] = names.reindex(panel["iso_code"]).to_numpy()
+
+    if latest_only:
+        panel = panel.groupby("country_order", sort=False).tail(1)
+    return panel[["year", "country", "displacement_score"]].reset_index(drop=True)
 
 
 # Helper to compute fossil and renewable energy columns
 def _prepare_energy_columns(df):
     df = df.copy()
-    df["fossil_energy"] = df[["coal_consumption", "oil_consumption", "gas_consumption"]].sum(axis=1)
-    df["renewables_energy"] = df[["solar_consumption", "wind_consumption", "hydro_consumption", "biofuel_consumption"]].sum(axis=1)
+    df["fossil_energy"] = df[FOSSIL_COLUMNS].sum(axis=1)
+    df["renewables_energy"] = df[RENEWABLE_COLUMNS].sum(axis=1)
     return df
 
 
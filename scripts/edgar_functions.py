@@ -1,11 +1,20 @@
 import pandas as pd
 
+from emissions_cube import EmissionsCube, COUNTRY, SECTOR, YEAR, SOURCE
+
+# Every function below accepts either the long EDGAR frame or an EmissionsCube
+# built from it; the cube answers from the pre-aggregated slice instead of
+# rescanning all rows.
+
 # 1. Top 5 emitting sectors in a country
 def top_sectors_by_country_year(df, country_code, year, top_n=5):
-    subset = df[(df['Country_code_A3'] == country_code) & (df['year'] == year)]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate(SECTOR, countries=country_code, years=year)
+    else:
+        subset = df[(df['Country_code_A3'] == country_code) & (df['year'] == year)]
+        totals = subset.groupby('ipcc_code_2006_for_standard_report_name', observed=True)['emissions_mtco2e'].sum()
     return (
-        subset.groupby('ipcc_code_2006_for_standard_report_name')['emissions_mtco2e']
-        .sum()
+        totals
         .sort_values(ascending=False)
         .head(top_n)
         .reset_index()
@@ -13,9 +22,11 @@ def top_sectors_by_country_year(df, country_code, year, top_n=5):
 
 # 2. Top 5 emitting countries globally
 def top_emitting_countries(df, year, top_n=5):
+    if isinstance(df, EmissionsCube):
+        return df.ranks.top(year, top_n)
     subset = df[df['year'] == year]
     return (
-        subset.groupby('Country_code_A3')['emissions_mtco2e']
+        subset.groupby('Country_code_A3', observed=True)['emissions_mtco2e']
         .sum()
         .sort_values(ascending=False)
         .head(top_n)
@@ -24,6 +35,8 @@ def top_emitting_countries(df, year, top_n=5):
 
 # 3. % of global emissions from top 5 countries
 def percent_from_top_emitters(df, year, top_n=5):
+    if isinstance(df, EmissionsCube):
+        return round(df.ranks.top_share(year, top_n) * 100, 2)
     total_global = df[df['year'] == year]['emissions_mtco2e'].sum()
     top_emitters = top_emitting_countries(df, year, top_n)
     top_total = top_emitters['emissions_mtco2e'].sum()
@@ -31,8 +44,10 @@ def percent_from_top_emitters(df, year, top_n=5):
 
 # 4. Rank of a country by emissions
 def emission_rank(df, country_code, year):
+    if isinstance(df, EmissionsCube):
+        return df.ranks.rank(country_code, year)
     subset = df[df['year'] == year]
-    country_totals = subset.groupby('Country_code_A3')['emissions_mtco2e'].sum().sort_values(ascending=False)
+    country_totals = subset.groupby('Country_code_A3', observed=True)['emissions_mtco2e'].sum().sort_values(ascending=False)
     rank = country_totals.reset_index().reset_index()
     rank.columns = ['rank', 'Country_code_A3', 'emissions_mtco2e']
     result = rank[rank['Country_code_A3'] == country_code]
@@ -43,7 +58,10 @@ def country_vs_top5(df, country_code, year):
     top_emitters = top_emitting_countries(df, year, top_n=5)
     
     # Create a DataFrame for the selected country's emission
-    country_emission = df[(df['Country_code_A3'] == country_code) & (df['year'] == year)]['emissions_mtco2e'].sum()
+    if isinstance(df, EmissionsCube):
+        country_emission = df.ranks.total(country_code, year)
+    else:
+        country_emission = df[(df['Country_code_A3'] == country_code) & (df['year'] == year)]['emissions_mtco2e'].sum()
     country_row = pd.DataFrame({
         'Country_code_A3': [country_code],
         'emissions_mtco2e': [country_emission]
@@ -55,27 +73,40 @@ def country_vs_top5(df, country_code, year):
     return comparison_df.sort_values(by='emissions_mtco2e', ascending=False).reset_index(drop=True)
 
 
+# 4b. Ranks of every country in every year (league-table export)
+def emission_rank_table(df):
+    cube = df if isinstance(df, EmissionsCube) else EmissionsCube.from_frame(df)
+    return cube.ranks.league_table()
+
 # 6. Emission trend over time for a country
 def emission_trend(df, country_code):
+    if isinstance(df, EmissionsCube):
+        return df.aggregate(YEAR, countries=country_code).reset_index()
     subset = df[df["Country_code_A3"] == country_code]
     return subset.groupby("year")["emissions_mtco2e"].sum().reset_index()
 
 # 7. Fossil vs Bio comparison in a country
 def fossil_bio_comparison(df, country_code, year):
-    subset = df[(df["Country_code_A3"] == country_code) & (df["year"] == year)]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate(SOURCE, countries=country_code, years=year).groupby(level="fossil_bio").sum()
+    else:
+        subset = df[(df["Country_code_A3"] == country_code) & (df["year"] == year)]
+        totals = subset.groupby("fossil_bio", observed=True)["emissions_mtco2e"].sum()
     return (
-        subset.groupby("fossil_bio")["emissions_mtco2e"]
-        .sum()
+        totals
         .reset_index()
         .rename(columns={"fossil_bio": "Source"})
     )
 
 # 8. Top 5 sectors globally (all fuels)
 def top_sectors_globally(df, year, top_n=5):
-    subset = df[df["year"] == year]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate(SECTOR, years=year)
+    else:
+        subset = df[df["year"] == year]
+        totals = subset.groupby("ipcc_code_2006_for_standard_report_name", observed=True)["emissions_mtco2e"].sum()
     return (
-        subset.groupby("ipcc_code_2006_for_standard_report_name")["emissions_mtco2e"]
-        .sum()
+        totals
         .sort_values(ascending=False)
         .head(top_n)
         .reset_index()
@@ -83,10 +114,13 @@ def top_sectors_globally(df, year, top_n=5):
 
 # 9. Top 5 fossil-fuel sectors globally
 def top_fossil_sectors_globally(df, year, top_n=5):
-    subset = df[(df["year"] == year) & (df["fossil_bio"] == "fossil")]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate(SECTOR, years=year, sources=df.source_positions(fossil_bio="fossil"))
+    else:
+        subset = df[(df["year"] == year) & (df["fossil_bio"] == "fossil")]
+        totals = subset.groupby("ipcc_code_2006_for_standard_report_name", observed=True)["emissions_mtco2e"].sum()
     return (
-        subset.groupby("ipcc_code_2006_for_standard_report_name")["emissions_mtco2e"]
-        .sum()
+        totals
         .sort_values(ascending=False)
         .head(top_n)
         .reset_index()
@@ -94,12 +128,18 @@ def top_fossil_sectors_globally(df, year, top_n=5):
 
 # 10. % of emissions from agriculture sectors in a country
 def agri_emissions_share(df, country_code, year):
-    subset = df[(df["Country_code_A3"] == country_code) & (df["year"] == year)]
-    total = subset["emissions_mtco2e"].sum()
-
     agri_keywords = ["agriculture", "enteric", "manure", "rice", "agricultural soils"]
-    agri_subset = subset[subset["ipcc_code_2006_for_standard_report_name"].str.lower().str.contains("|".join(agri_keywords))]
-    agri_total = agri_subset["emissions_mtco2e"].sum()
+
+    if isinstance(df, EmissionsCube):
+        total = df.aggregate(countries=country_code, years=year)
+        agri_sectors = df.sectors_matching("|".join(agri_keywords))
+        agri_total = df.aggregate(countries=country_code, years=year, sectors=agri_sectors)
+    else:
+        subset = df[(df["Country_code_A3"] == country_code) & (df["year"] == year)]
+        total = subset["emissions_mtco2e"].sum()
+
+        agri_subset = subset[subset["ipcc_code_2006_for_standard_report_name"].str.lower().str.contains("|".join(agri_keywords), na=False)]
+        agri_total = agri_subset["emissions_mtco2e"].sum()
 
     share = (agri_total / total) * 100 if total > 0 else 0
     return round(share, 2)
@@ -107,10 +147,13 @@ def agri_emissions_share(df, country_code, year):
 
 # Top CH4 or N2O emitting countries
 def top_emitters_by_gas(df, gas, year, top_n=10):
-    subset = df[(df["year"] == year) & (df["Substance"].str.upper() == gas.upper())]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate(COUNTRY, years=year, sources=df.source_positions(substance=gas))
+    else:
+        subset = df[(df["year"] == year) & (df["Substance"].str.upper() == gas.upper())]
+        totals = subset.groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum()
     top_emitters = (
-        subset.groupby("Country_code_A3")["emissions_mtco2e"]
-        .sum()
+        totals
         .sort_values(ascending=False)
         .head(top_n)
         .reset_index()
@@ -118,32 +161,44 @@ def top_emitters_by_gas(df, gas, year, top_n=10):
     return top_emitters
 
 def compare_emission_trends(df, countries):
-    subset = df[df["Country_code_A3"].isin(countries)]
-    grouped = subset.groupby(["year", "Country_code_A3"])["emissions_mtco2e"].sum().reset_index()
+    if isinstance(df, EmissionsCube):
+        grouped = df.aggregate([YEAR, COUNTRY], countries=countries).reset_index()
+    else:
+        subset = df[df["Country_code_A3"].isin(countries)]
+        grouped = subset.groupby(["year", "Country_code_A3"], observed=True)["emissions_mtco2e"].sum().reset_index()
     return grouped.pivot(index="year", columns="Country_code_A3", values="emissions_mtco2e")
 
 
 def compare_sector_by_country(df, sector_name, year):
-    subset = df[(df["year"] == year) & 
-                (df["ipcc_code_2006_for_standard_report_name"] == sector_name)]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate(COUNTRY, sectors=sector_name, years=year)
+    else:
+        subset = df[(df["year"] == year) & 
+                    (df["ipcc_code_2006_for_standard_report_name"] == sector_name)]
+        totals = subset.groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum()
     return (
-        subset.groupby("Country_code_A3")["emissions_mtco2e"]
-        .sum()
+        totals
         .sort_values(ascending=False)
         .reset_index()
     )
 
 
 def sector_profiles(df, countries, year):
-    subset = df[(df["year"] == year) & (df["Country_code_A3"].isin(countries))]
-    grouped = subset.groupby(["Country_code_A3", "ipcc_code_2006_for_standard_report_name"])["emissions_mtco2e"].sum().reset_index()
+    if isinstance(df, EmissionsCube):
+        grouped = df.aggregate([COUNTRY, SECTOR], countries=countries, years=year).reset_index()
+    else:
+        subset = df[(df["year"] == year) & (df["Country_code_A3"].isin(countries))]
+        grouped = subset.groupby(["Country_code_A3", "ipcc_code_2006_for_standard_report_name"], observed=True)["emissions_mtco2e"].sum().reset_index()
     return grouped.pivot(index="ipcc_code_2006_for_standard_report_name", columns="Country_code_A3", values="emissions_mtco2e").fillna(0)
 
 def stacked_sector_breakdown(df, countries, year):
-    subset = df[(df["year"] == year) & (df["Country_code_A3"].isin(countries))]
+    if isinstance(df, EmissionsCube):
+        totals = df.aggregate([COUNTRY, SECTOR], countries=countries, years=year)
+    else:
+        subset = df[(df["year"] == year) & (df["Country_code_A3"].isin(countries))]
+        totals = subset.groupby(["Country_code_A3", "ipcc_code_2006_for_standard_report_name"], observed=True)["emissions_mtco2e"].sum()
     return (
-        subset.groupby(["Country_code_A3", "ipcc_code_2006_for_standard_report_name"])["emissions_mtco2e"]
-        .sum()
+        totals
         .reset_index()
         .pivot(index="Country_code_A3", columns="ipcc_code_2006_for_standard_report_name", values="emissions_mtco2e")
         .fillna(0)
@@ -151,12 +206,16 @@ def stacked_sector_breakdown(df, countries, year):
 
 
 def sector_contribution(df, country_code, year):
-    subset = df[(df["Country_code_A3"] == country_code) & (df["year"] == year)]
-    total = subset["emissions_mtco2e"].sum()
+    if isinstance(df, EmissionsCube):
+        total = df.aggregate(countries=country_code, years=year)
+        totals = df.aggregate(SECTOR, countries=country_code, years=year)
+    else:
+        subset = df[(df["Country_code_A3"] == country_code) & (df["year"] == year)]
+        total = subset["emissions_mtco2e"].sum()
+        totals = subset.groupby("ipcc_code_2006_for_standard_report_name", observed=True)["emissions_mtco2e"].sum()
 
     sector_df = (
-        subset.groupby("ipcc_code_2006_for_standard_report_name")["emissions_mtco2e"]
-        .sum()
+        totals
         .reset_index()
         .sort_values(by="emissions_mtco2e", ascending=False)
     )
@@ -166,8 +225,11 @@ def sector_contribution(df, country_code, year):
 
 
 def fastest_growing_sectors(df, start_year=2000, end_year=2023, top_n=5):
-    subset = df[(df["year"].isin([start_year, end_year]))]
-    grouped = subset.groupby(["ipcc_code_2006_for_standard_report_name", "year"])["emissions_mtco2e"].sum().reset_index()
+    if isinstance(df, EmissionsCube):
+        grouped = df.aggregate([SECTOR, YEAR], years=[start_year, end_year]).reset_index()
+    else:
+        subset = df[(df["year"].isin([start_year, end_year]))]
+        grouped = subset.groupby(["ipcc_code_2006_for_standard_report_name", "year"], observed=True)["emissions_mtco2e"].sum().reset_index()
 
     pivoted = grouped.pivot(index="ipcc_code_2006_for_standard_report_name", columns="year", values="emissions_mtco2e")
     pivoted["growth_rate_%"] = ((pivoted[end_year] - pivoted[start_year]) / pivoted[start_year]) * 100
@@ -177,9 +239,14 @@ def fastest_growing_sectors(df, start_year=2000, end_year=2023, top_n=5):
 
 def manufacturing_vs_global_avg(df, country_code, year):
     sector_name = "Manufacturing Industries and Construction"
+    if isinstance(df, EmissionsCube):
+        global_mean = df.aggregate(COUNTRY, sectors=sector_name, years=year).mean()
+        country_value = df.aggregate(countries=country_code, sectors=sector_name, years=year)
+        return round(country_value, 2), round(global_mean, 2)
+
     global_mean = (
         df[(df["ipcc_code_2006_for_standard_report_name"] == sector_name) & (df["year"] == year)]
-        .groupby("Country_code_A3")["emissions_mtco2e"]
+        .groupby("Country_code_A3", observed=True)["emissions_mtco2e"]
         .sum()
         .mean()
     )
@@ -194,6 +261,8 @@ def manufacturing_vs_global_avg(df, country_code, year):
 
 
 def cumulative_emissions(df, country_code, start_year=1970, end_year=2023):
+    if isinstance(df, EmissionsCube):
+        return round(df.aggregate(countries=country_code, years=df.year_range(start_year, end_year)), 2)
     subset = df[
         (df["Country_code_A3"] == country_code) &
         (df["year"] >= start_year) &
@@ -203,6 +272,8 @@ def cumulative_emissions(df, country_code, start_year=1970, end_year=2023):
 
 def cumulative_emissions_n_years(df, country_code, selected_year, n_years):
     start_year = selected_year - n_years + 1
+    if isinstance(df, EmissionsCube):
+        return round(df.aggregate(countries=country_code, years=df.year_range(start_year, selected_year)), 2)
     subset = df[
         (df["Country_code_A3"] == country_code) &
         (df["year"] >= start_year) &
@@ -212,8 +283,12 @@ def cumulative_emissions_n_years(df, country_code, selected_year, n_years):
 
 def top_growth_countries(df, end_year, n_years=5, top_n=10):
     start_year = end_year - n_years + 1
-    df_start = df[df["year"] == start_year].groupby("Country_code_A3")["emissions_mtco2e"].sum()
-    df_end = df[df["year"] == end_year].groupby("Country_code_A3")["emissions_mtco2e"].sum()
+    if isinstance(df, EmissionsCube):
+        df_start = df.aggregate(COUNTRY, years=start_year)
+        df_end = df.aggregate(COUNTRY, years=end_year)
+    else:
+        df_start = df[df["year"] == start_year].groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum()
+        df_end = df[df["year"] == end_year].groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum()
     
     df_growth = pd.DataFrame({
         "start_emissions": df_start,
@@ -226,14 +301,22 @@ def top_growth_countries(df, end_year, n_years=5, top_n=10):
     return df_growth.sort_values("growth_rate", ascending=False).head(top_n).reset_index()
 
 def compare_country_with_global(df, country_code, year):
+    if isinstance(df, EmissionsCube):
+        global_avg = df.aggregate(COUNTRY, years=year).mean()
+        country_total = df.aggregate(countries=country_code, years=year)
+        return round(country_total, 2), round(global_avg, 2)
     global_df = df[df["year"] == year]
-    global_avg = global_df.groupby("Country_code_A3")["emissions_mtco2e"].sum().mean()
+    global_avg = global_df.groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum().mean()
     country_total = global_df[global_df["Country_code_A3"] == country_code]["emissions_mtco2e"].sum()
     return round(country_total, 2), round(global_avg, 2)
 
 def compare_sector_with_global(df, country_code, sector_name, year):
+    if isinstance(df, EmissionsCube):
+        global_avg = df.aggregate(COUNTRY, sectors=sector_name, years=year).mean()
+        country_val = df.aggregate(countries=country_code, sectors=sector_name, years=year)
+        return round(country_val, 2), round(global_avg, 2)
     global_df = df[(df["year"] == year) & (df["ipcc_code_2006_for_standard_report_name"] == sector_name)]
-    global_avg = global_df.groupby("Country_code_A3")["emissions_mtco2e"].sum().mean()
+    global_avg = global_df.groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum().mean()
     country_val = global_df[global_df["Country_code_A3"] == country_code]["emissions_mtco2e"].sum()
     return round(country_val, 2), round(global_avg, 2)
 
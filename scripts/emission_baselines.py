@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from dataset_registry import get_datasets
+from emissions_cube import COUNTRY, YEAR
+from forecast_policy_impact import SECTOR_FLAGS, forecast_scenarios, forecast_scenarios_mc
+from policy_vectorizer import DEFAULT_FEATURES, GEN_INFO_PATH, clean_policy_vectors, extract_features
+
+# Years of history used for the business-as-usual trend
+TREND_YEARS = 10
+# Forecast horizon (years after the latest EDGAR year)
+HORIZON_YEARS = 10
+
+# Policy features a scenario needs: the clustering columns plus the US$ price
+# and the share of jurisdiction emissions covered
+SCENARIO_FEATURES = [*DEFAULT_FEATURES, "price_usd", "emissions_share"]
+
+# EDGAR IPCC 2006 sector names (lower-cased regex) behind each covers_* flag
+SECTOR_PATTERNS = {
+    "covers_transport": r"transport|aviation|navigation|railways",
+    "covers_industry": r"industr|manufactur|chemical|metal|mineral|cement|non-energy products",
+    "covers_buildings": r"residential|commercial|buildings",
+    "covers_agriculture": r"enteric|manure|agricultur|rice|liming|urea|biomass burning",
+    "covers_lulucf": r"land use|forest",
+}
+
+# Jurisdiction spellings in gen_info that differ from EDGAR / World Bank names
+NAME_ALIASES = {
+    "türkiye": "TUR",
+    "côte d’ivoire": "CIV",
+    "taiwan, china": "TWN",
+}
+
+
+def _latest_and_trend(matrix, years, trend_years):
+    # Last reported year per country, and log-linear growth over the window before it
+    present = ~np.isnan(matrix)
+    has_data = present.any(axis=1)
+    last = matrix.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    rows = np.arange(len(matrix))
+    latest = np.where(has_data, matrix[rows, last], np.nan)
+
+    in_window = (years[None, :] > years[last][:, None] - trend_years) & (years[None, :] <= years[last][:, None])
+    usable = present & in_window & (np.nan_to_num(matrix) > 0)
+    x = np.where(usable, years[None, :], 0.0)
+    y = np.where(usable, np.log(np.where(usable, matrix, 1.0)), 0.0)
+    n = usable.sum(axis=1)
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    denominator = n * (x * x).sum(axis=1) - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where((n >= 2) & (denominator > 0), (n * (x * y).sum(axis=1) - sx * sy) / denominator, 0.0)
+    return latest, years[last], np.expm1(slope)
+
+
+def compute_baselines(cube, trend_years=TREND_YEARS):
+    """
+    Per-country emission baselines from the EDGAR cube: the latest reported
+    total (MtCO₂e) and its year, the annual growth trend over the last
+    `trend_years`, and the latest emissions of the sectors behind each
+    covers_* flag. Indexed by Country_code_A3.
+    """
+    totals = cube.aggregate(by=[COUNTRY, YEAR]).unstack(YEAR)
+    years = totals.columns.to_numpy(dtype=np.int64)
+    latest, latest_year, growth = _latest_and_trend(totals.to_numpy(dtype=np.float64), years, trend_years)
+    baselines = pd.DataFrame({
+        "latest_year": latest_year,
+        "latest_emissions": latest,
+        "trend_growth": growth,
+    }, index=totals.index)
+
+    # Sector emissions in each country's latest year
+    positions = np.searchsorted(years, latest_year)
+    for flag, pattern in SECTOR_PATTERNS.items():
+        sectors = cube.sectors_matching(pattern)
+        if not sectors:
+            baselines[f"{flag}_emissions"] = 0.0
+            continue
+        by_year = (cube.aggregate(by=[COUNTRY, YEAR], sectors=sectors).unstack(YEAR)
+                   .reindex(index=totals.index, columns=totals.columns))
+        values = by_year.to_numpy(dtype=np.float64)[np.arange(len(by_year)), positions]
+        baselines[f"{flag}_emissions"] = np.nan_to_num(values)
+    return baselines[baselines["latest_emissions"].notna()]
+
+
+def country_code_lookup(df_edgar, df_population):
+    """Lower-cased country name -> Country_code_A3, from EDGAR and World Bank names plus NAME_ALIASES."""
+    lookup = {}
+    for df, name_col in ((df_population, "Country"), (df_edgar, "Name")):
+        if name_col not in df.columns:
+            continue
+        pairs = df[[name_col, COUNTRY]].drop_duplicates().dropna()
+        lookup.update(zip(pairs[name_col].astype(str).str.strip().str.lower(), pairs[COUNTRY].astype(str)))
+    lookup.update(NAME_ALIASES)
+    return lookup
+
+
+def _policy_type(vectors):
+    # Same precedence as the clustering page: Tax, then ETS, then Hybrid
+    return np.select(
+        [vectors["policy_type_tax"] == 1, vectors["policy_type_ets"] == 1, vectors["policy_type_hybrid"] == 1],
+        ["Tax", "ETS", "Hybrid"], default="Other",
+    )
+
+
+def build_country_scenarios(vectors=None, horizon_years=HORIZON_YEARS, coverage=None,
+                            use_sectors=False, apply_trend=True):
+    """
+    One forecast scenario per policy in `vectors` (SCENARIO_FEATURES
+    extracted from gen_info.csv by default) whose jurisdiction has EDGAR
+    emissions; subnational and regional jurisdictions without a country code
+    are left out.
+
+    Each scenario starts from the country's latest EDGAR total in its latest
+    year. With `use_sectors`, it starts from the emissions of the flagged
+    sectors only. With `apply_trend`, the historical growth continues
+    underneath the policy; judge the policy by the *_vs_bau metrics then,
+    since percent_reduction still compares with the starting year. Coverage is the share of jurisdiction emissions
+    covered where the vectors report it (100 otherwise), unless `coverage`
+    is given. Prices are the US$ price_usd column; vectors without it, or
+    without share_jurisdiction_emissions when `coverage` is not given, raise
+    KeyError rather than forecasting from the €/US$-only price_signal.
+    """
+    if vectors is None:
+        vectors = clean_policy_vectors(extract_features(pd.read_csv(GEN_INFO_PATH), SCENARIO_FEATURES))
+    required = ["price_usd"] + (["share_jurisdiction_emissions"] if coverage is None else [])
+    missing = [column for column in required if column not in vectors.columns]
+    if missing:
+        raise KeyError(f"Policy vectors missing columns: {missing} (extract SCENARIO_FEATURES)")
+    baselines, lookup = get_datasets("emission_baselines", "country_codes")
+
+    codes = vectors["jurisdiction"].astype(str).str.strip().str.lower().map(lookup)
+    vectors = vectors.assign(country_code=codes)
+    vectors = vectors[vectors["country_code"].isin(baselines.index)]
+    base = baselines.loc[vectors["country_code"]].set_axis(vectors.index)
+
+    flags = vectors[SECTOR_FLAGS].to_numpy(dtype=np.float64)
+    if use_sectors:
+        sector_emissions = base[[f"{flag}_emissions" for flag in SECTOR_FLAGS]].to_numpy()
+        initial = (flags * sector_emissions).sum(axis=1)
+    else:
+        initial = base["latest_emissions"].to_numpy()
+
+    coverage_pct = np.full(len(vectors), 100.0 if coverage is None else float(coverage))
+    if coverage is None:
+        # A share of 0 means gen_info does not report it
+        share = vectors["share_jurisdiction_emissions"].to_numpy(dtype=np.float64) * 100
+        coverage_pct = np.where(share > 0, share, coverage_pct)
+
+
+    return pd.DataFrame({
+        "country": vectors["jurisdiction"].str.strip(),
+        "country_code": vectors["country_code"],
+        "initial_emissions": initial,
+        "policy_type": _policy_type(vectors),
+        "price_signal": vectors["price_usd"].to_numpy(dtype=np.float64),
+        "coverage": coverage_pct,
+        "duration_years": horizon_years,
+        **{flag: vectors[flag].to_numpy() for flag in SECTOR_FLAGS},
+        "baseline_growth": base["trend_growth"].to_numpy() if apply_trend else 0.0,
+        "start_year": base["latest_year"].to_numpy(),
+    }, index=vectors.index)
+
+
+def forecast_all_countries(vectors=None, horizon_years=HORIZON_YEARS, coverage=None, use_sectors=False,
+                           apply_trend=True, monte_carlo=False, **monte_carlo_options):
+    """
+    What-if forecast for every country policy in gen_info.csv in one
+    vectorized call, from cached EDGAR baselines. Returns the same
+    (forecast_df, metrics_df) as forecast_scenarios, or forecast_scenarios_mc
+    when `monte_carlo` is set, with a country_code column on the metrics.
+    """
+    scenarios = build_country_scenarios(vectors, horizon_years, coverage, use_sectors, apply_trend)
+    if monte_carlo:
+        forecast_df, metrics_df = forecast_scenarios_mc(scenarios, **monte_carlo_options)
+    else:
+        forecast_df, metrics_df = forecast_scenarios(scenarios)
+    metrics_df.insert(2, "country_code", scenarios["country_code"].to_numpy())
+    return forecast_df, metrics_df
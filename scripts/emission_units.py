@@ -0,0 +1,68 @@
+import re
+from functools import lru_cache
+
+# Tonnes of CO₂e per unit of each recognised suffix
+UNIT_SCALE = {"kg": 1e-3, "t": 1.0, "kt": 1e3, "mt": 1e6, "gt": 1e9}
+
+_NUMBER = r"[-+]?\d+(?:\.\d+)?"
+_IMPACT = re.compile(
+    rf"^\s*(?P<low>{_NUMBER})"
+    rf"(?:\s*(?:-|to)\s*(?P<high>{_NUMBER}))?"
+    r"\s*(?P<rest>.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# Gas suffix after the unit: CO2e, CO₂e, CO2-eq, CO2 ...
+_GAS = r"\s*co[2₂](?:e|-?eq)?"
+# A unit (kg, t, kt, Mt, Gt, with optional "on"/"onne(s)") and optional gas suffix,
+# ending at a non-letter so "Mtpa" is not read as "Mt"
+_UNIT = re.compile(rf"^(?P<unit>kg|[kmg]?t)(?:on(?:ne)?s?)?(?:{_GAS})?(?![a-z])", re.IGNORECASE)
+_GAS_ONLY = re.compile(rf"^{_GAS}(?![a-z])", re.IGNORECASE)
+
+
+def parse_co2e_impact(value):
+    """
+    Parse a `CO₂e Impact` value such as '–1.6 tons', '–5,000 tons',
+    '+0.8 Mt/year', '–1.5 kt', '5 MtCO2e' or '1–2 Mt' into tonnes of CO₂e
+    (ranges give their midpoint). Plain numbers are taken as tonnes. Returns
+    None when no number can be read or the unit is not recognised. Results
+    are memoised per distinct string.
+
+    >>> parse_co2e_impact("5 MtCO2e"), parse_co2e_impact("2 ktCO2e/year")
+    (5000000.0, 2000.0)
+    >>> parse_co2e_impact("-1.2–1.5 Mt"), parse_co2e_impact("–1.2 to -1.5 Mt")
+    (-1350000.0, -1350000.0)
+    >>> parse_co2e_impact("1–2 Mt"), parse_co2e_impact("4 Mtpa")
+    (1500000.0, None)
+    """
+    if isinstance(value, str):
+        return _parse_impact_string(value)
+    if isinstance(value, (int, float)) and value == value:
+        return float(value)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_impact_string(text):
+    # En/em dashes and the minus sign all mean '-'; commas are thousands separators
+    clean = text.replace("–", "-").replace("—", "-").replace("−", "-").replace(",", "")
+    match = _IMPACT.match(clean)
+    if not match:
+        return None
+    low, high = match.group("low"), match.group("high")
+    value = float(low)
+    if high is not None:
+        # The leading sign covers an unsigned upper bound: "-1.2–1.5 Mt" is -1.2 to -1.5
+        if low[0] in "+-" and high[0] not in "+-":
+            high = low[0] + high
+        value = (value + float(high)) / 2
+
+    rest = match.group("rest")
+    unit_match = _UNIT.match(rest)
+    if unit_match:
+        unit = unit_match.group("unit").lower()
+    elif rest[:1].isalpha() and not _GAS_ONLY.match(rest):
+        # A unit-like token we don't recognise: don't guess tonnes
+        return None
+    else:
+        unit = "t"
+    return value * UNIT_SCALE[unit]
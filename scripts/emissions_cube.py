@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+
+COUNTRY = "Country_code_A3"
+SECTOR = "ipcc_code_2006_for_standard_report_name"
+YEAR = "year"
+SOURCE = "source"
+VALUE = "emissions_mtco2e"
+
+_AXES = {COUNTRY: 0, SECTOR: 1, YEAR: 2, SOURCE: 3}
+
+
+class EmissionsCube:
+    """
+    Pre-aggregated EDGAR emissions held as a dense
+    float32 country x sector x year x source array, where a source is a
+    (Substance, fossil_bio) pair. Built once from a long frame; queries
+    only touch the requested slice.
+
+    Cells with no rows in the source frame are NaN, so the set of groups
+    returned by `aggregate` matches a pandas groupby over the same filter.
+    """
+
+    def __init__(self, values, countries, sectors, years, sources):
+        self.values = values
+        self.countries = countries
+        self.sectors = sectors
+        self.years = years
+        self.sources = sources
+        self._labels = (countries, sectors, years, sources)
+        self._ranks = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the cube from a long-format EDGAR frame (plain or compact schema)."""
+        codes, labels = [], []
+        for col in (COUNTRY, SECTOR, YEAR):
+            col_codes, uniques = pd.factorize(df[col], sort=True, use_na_sentinel=False)
+            codes.append(col_codes)
+            labels.append(pd.Index(np.asarray(uniques), name=col))
+
+        # Sources: the observed (Substance, fossil_bio) pairs
+        sub_codes, substances = pd.factorize(df["Substance"], sort=True, use_na_sentinel=False)
+        fb_codes, fossil_bio = pd.factorize(df["fossil_bio"], sort=True, use_na_sentinel=False)
+        pair_codes, pairs = pd.factorize(sub_codes * len(fossil_bio) + fb_codes, sort=True)
+        codes.append(pair_codes)
+        labels.append(pd.MultiIndex.from_arrays(
+            [np.asarray(substances)[pairs // len(fossil_bio)], np.asarray(fossil_bio)[pairs % len(fossil_bio)]],
+            names=["Substance", "fossil_bio"],
+        ))
+
+        shape = tuple(len(l) for l in labels)
+        flat = np.ravel_multi_index(codes, shape)
+        size = int(np.prod(shape))
+        weights = np.nan_to_num(df[VALUE].to_numpy(dtype="float64"))
+        # Summed in float64, stored as float32 like the compact frames
+        values = np.bincount(flat, weights=weights, minlength=size).astype(np.float32)
+        values[np.bincount(flat, minlength=size) == 0] = np.nan
+        return cls(values.reshape(shape), *labels)
+
+    @property
+    def ranks(self):
+        """Per-year country rank tables, built on first use."""
+        if self._ranks is None:
+            self._ranks = CountryRankIndex.from_cube(self)
+        return self._ranks
+
+    # --- Label helpers ---
+    def year_range(self, start_year, end_year):
+        """Year labels within [start_year, end_year]."""
+        years = self.years
+        return years[(years >= start_year) & (years <= end_year)].tolist()
+
+    def sectors_matching(self, pattern):
+        """Sector labels whose lower-cased name contains the regex `pattern`."""
+        names = self.sectors.to_series().dropna()
+        return names[names.str.lower().str.contains(pattern)].tolist()
+
+    def source_positions(self, substance=None, fossil_bio=None):
+        """Positions on the source axis for a substance (case-insensitive) and/or fossil_bio flag."""
+        mask = np.ones(len(self.sources), dtype=bool)
+        if substance is not None:
+            subs = self.sources.get_level_values("Substance").astype(str).str.upper()
+            mask &= np.asarray(subs == str(substance).upper())
+        if fossil_bio is not None:
+            mask &= np.asarray(self.sources.get_level_values("fossil_bio") == fossil_bio)
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def _positions(labels, wanted):
+        if not pd.api.types.is_list_like(wanted):
+            wanted = [wanted]
+        positions = labels.get_indexer(list(wanted))
+        return positions[positions >= 0]
+
+    # --- Query ---
+    def aggregate(self, by=(), countries=None, sectors=None, years=None, sources=None):
+        """
+        Sum emissions over every dimension not in `by`, restricted to the given
+        labels. Mirrors `df[filters].groupby(by)["emissions_mtco2e"].sum()`:
+        returns a Series (MultiIndex for two dimensions), or a float when `by`
+        is empty. `sources` takes positions from `source_positions`.
+        """
+        if isinstance(by, str):
+            by = [by]
+        by = list(by)
+
+        sub = self.values
+        labels = list(self._labels)
+        for axis, wanted in enumerate((countries, sectors, years)):
+            if wanted is not None:
+                positions = self._positions(labels[axis], wanted)
+                sub = sub.take(positions, axis=axis)
+                labels[axis] = labels[axis].take(positions)
+        if sources is not None:
+            sub = sub.take(sources, axis=3)
+            labels[3] = labels[3].take(sources)
+
+        by_axes = [_AXES[dim] for dim in by]
+        other = tuple(axis for axis in range(4) if axis not in by_axes)
+        if not by_axes:
+            return float(np.nansum(sub, dtype=np.float64))
+
+        # Accumulate in float64 over the float32 cells
+        totals = np.nansum(sub, axis=other, dtype=np.float64)
+        present = (~np.isnan(sub)).any(axis=other)
+        # Remaining axes come out in array order; reorder them to match `by`
+        order = np.argsort(np.argsort(by_axes))
+        totals = totals.transpose(order)
+        present = present.transpose(order)
+
+        if len(by_axes) == 1:
+            index = labels[by_axes[0]]
+        else:
+            index = pd.MultiIndex.from_product([labels[axis] for axis in by_axes], names=by)
+        result = pd.Series(totals.ravel(), index=index, name=VALUE)[present.ravel()]
+
+        # groupby drops missing keys
+        if len(by_axes) == 1 and by[0] != SOURCE:
+            result = result[result.index.notna()]
+        elif len(by_axes) > 1:
+            keep = np.ones(len(result), dtype=bool)
+            for level, dim in enumerate(by):
+                if dim != SOURCE:
+                    keep &= np.asarray(pd.notna(result.index.get_level_values(level)))
+            result = result[keep]
+        return result
+
+
+class CountryRankIndex:
+    """
+    Year x country matrices of total emissions, ranks and cumulative global
+    shares. Rank, top-N and share-of-global queries become array lookups.
+    """
+
+    def __init__(self, years, countries, totals, global_totals):
+        self.years = years
+        self.countries = countries
+        self.totals = totals
+        self.global_totals = global_totals
+
+        present = ~np.isnan(totals)
+        self.n_present = present.sum(axis=1)
+        # Descending order per year; countries without rows sort last
+        self.order = np.argsort(-np.where(present, totals, -np.inf), axis=1, kind="stable")
+        sorted_totals = np.take_along_axis(np.nan_to_num(totals), self.order, axis=1)
+
+        self.ranks = np.full(totals.shape, np.nan)
+        positions = np.broadcast_to(np.arange(1, totals.shape[1] + 1, dtype=float), totals.shape)
+        np.put_along_axis(self.ranks, self.order, positions, axis=1)
+        self.ranks[~present] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.shares = totals / global_totals[:, None]
+            self.cumulative_shares = np.cumsum(sorted_totals, axis=1) / global_totals[:, None]
+
+    @classmethod
+    def from_cube(cls, cube):
+        totals = np.nansum(cube.values, axis=(1, 3), dtype=np.float64)
+        present = (~np.isnan(cube.values)).any(axis=(1, 3))
+        totals = np.where(present, totals, np.nan)
+        global_totals = np.nansum(cube.values, axis=(0, 1, 3), dtype=np.float64)
+
+        # Rows without a country code count toward the global total only
+        keep = np.asarray(cube.countries.notna())
+        return cls(cube.years, cube.countries[keep], totals[keep].T, global_totals)
+
+    def _year_pos(self, year):
+        pos = self.years.get_indexer([year])[0]
+        return None if pos < 0 else pos
+
+    def total(self, country_code, year):
+        """Total emissions of a country in a year (0.0 if it has no rows)."""
+        y = self._year_pos(year)
+        c = self.countries.get_indexer([country_code])[0]
+        if y is None or c < 0 or np.isnan(self.totals[y, c]):
+            return 0.0
+        return float(self.totals[y, c])
+
+    def rank(self, country_code, year):
+        """1-based global rank of a country in a year, or None."""
+        y = self._year_pos(year)
+        c = self.countries.get_indexer([country_code])[0]
+        if y is None or c < 0 or np.isnan(self.ranks[y, c]):
+            return None
+        return int(self.ranks[y, c])
+
+    def top(self, year, top_n=5):
+        """Top-N emitters for a year, largest first."""
+        y = self._year_pos(year)
+        if y is None:
+            return pd.DataFrame({COUNTRY: [], VALUE: []})
+        positions = self.order[y, :min(top_n, self.n_present[y])]
+        return pd.DataFrame({
+            COUNTRY: self.countries[positions],
+            VALUE: self.totals[y, positions],
+        })
+
+    def top_share(self, year, top_n=5):
+        """Fraction of global emissions from the top-N emitters in a year."""
+        y = self._year_pos(year)
+        if y is None:
+            return np.nan
+        n = min(top_n, self.n_present[y])
+        return float(self.cumulative_shares[y, n - 1]) if n > 0 else 0.0
+
+    def league_table(self):
+        """
+        Ranks for every country across every year in one long frame:
+        year, country, emissions, rank, share and cumulative share of global.
+        """
+        present = ~np.isnan(self.totals)
+        year_pos, country_pos = np.nonzero(present)
+        rank = self.ranks[year_pos, country_pos].astype(int)
+        cumulative = self.cumulative_shares[year_pos, rank - 1]
+        table = pd.DataFrame({
+            YEAR: self.years[year_pos],
+            COUNTRY: self.countries[country_pos],
+            VALUE: self.totals[year_pos, country_pos],
+            "rank": rank,
+            "share_pct": self.shares[year_pos, country_pos] * 100,
+            "cumulative_share_pct": cumulative * 100,
+        })
+        return table.sort_values([YEAR, "rank"]).reset_index(drop=True)
@@ -0,0 +1,177 @@
+import threading
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from load_edgar import (
+    EDGAR_DIMENSIONS,
+    compact_edgar_frame,
+    load_edgar_ipcc2006,
+    load_edgar_co2,
+    load_edgar_co2bio,
+    load_edgar_ch4,
+    load_edgar_n2o,
+    is_edgar_cached,
+)
+from emissions_cube import EmissionsCube
+from parallel_loader import load_parallel
+
+# Base gases and their loaders, in storage order
+GAS_LOADERS = {
+    "ghg": load_edgar_ipcc2006,
+    "co2": load_edgar_co2,
+    "co2bio": load_edgar_co2bio,
+    "ch4": load_edgar_ch4,
+    "n2o": load_edgar_n2o,
+}
+
+# Workbook behind each base gas (the loaders' default paths)
+GAS_FILES = {
+    "ghg": "data/EDGAR_AR5_GHG_1970_2023.xlsx",
+    "co2": "data/EDGAR_CO2_1970_2023.xlsx",
+    "co2bio": "data/EDGAR_CO2bio_1970_2023.xlsx",
+    "ch4": "data/EDGAR_CH4_1970_2023.xlsx",
+    "n2o": "data/EDGAR_N2O_1970_2023.xlsx",
+}
+
+# Derived gases are sums of base gases, materialised on first use
+DERIVED_GASES = {
+    "co2_total": ("co2", "co2bio"),
+}
+
+
+def _freeze(df):
+    # Mark every column buffer (category codes included) read-only, so a
+    # shared frame raises on in-place writes instead of changing it for all
+    for col in df.columns:
+        values = df[col].array
+        array = values.codes if isinstance(values, pd.Categorical) else np.asarray(values)
+        while isinstance(array, np.ndarray):
+            array.flags.writeable = False
+            array = array.base
+    return df
+
+
+class EmissionsStore:
+    """
+    All EDGAR gases in one long frame keyed by a `gas` column. Dimension
+    columns share one set of categories across gases, rows are stored
+    contiguously per gas, and derived totals and per-gas cubes are built
+    lazily and cached. The frame is shared (see dataset_registry), so its
+    buffers are read-only.
+    """
+
+    def __init__(self, data, gas_slices):
+        self.data = _freeze(data)
+        self._slices = gas_slices
+        self._derived = {}
+        self._cubes = {}
+        # Guards the lazy derived frames and cubes: the store is shared across sessions
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Build the store from a dict of gas -> long EDGAR frame."""
+        frames = {gas: compact_edgar_frame(df) for gas, df in frames.items()}
+
+        # One shared category set per dimension so the concat stays categorical
+        for col in EDGAR_DIMENSIONS:
+            categories = union_categoricals([df[col] for df in frames.values()], sort_categories=True).categories
+            for df in frames.values():
+                df[col] = df[col].cat.set_categories(categories)
+
+        gas_slices, start = {}, 0
+        for gas, df in frames.items():
+            gas_slices[gas] = (start, start + len(df))
+            start += len(df)
+
+        data = pd.concat(frames.values(), ignore_index=True)
+        gas_codes = np.repeat(np.arange(len(frames)), [len(df) for df in frames.values()])
+        data["gas"] = pd.Categorical.from_codes(gas_codes, categories=list(frames))
+        return cls(data, gas_slices)
+
+    @classmethod
+    def load(cls, gases=None, use_processes=None):
+        """
+        Load the given base gases (all by default) concurrently into a single
+        store. By default a cold load, where some workbook has no frame cache
+        yet, runs in processes: openpyxl parsing holds the GIL, so threads
+        would parse the workbooks one at a time. Warm loads only read Parquet,
+        which releases the GIL, so they use threads.
+        """
+        gases = gases or list(GAS_LOADERS)
+        if use_processes is None:
+            use_processes = not all(is_edgar_cached(GAS_FILES[gas], compact=True) for gas in gases)
+        frames = load_parallel(
+            [(gas, partial(GAS_LOADERS[gas], compact=True)) for gas in gases],
+            use_processes=use_processes,
+        )
+        return cls.from_frames(dict(zip(gases, frames)))
+
+    # --- Shared indexes ---
+    @property
+    def gases(self):
+        return list(self._slices) + [g for g, parts in DERIVED_GASES.items() if all(p in self._slices for p in parts)]
+
+    @property
+    def countries(self):
+        return list(self.data["Country_code_A3"].cat.categories)
+
+    @property
+    def sectors(self):
+        return list(self.data["ipcc_code_2006_for_standard_report_name"].cat.categories)
+
+    @property
+    def years(self):
+        return sorted(self.data["year"].unique())
+
+    # --- Per-gas access ---
+    def frame(self, gas):
+        """Long frame for one gas (a row slice of the shared frame for base gases)."""
+        if gas in self._slices:
+            return self._slice(gas)
+        with self._lock:
+            if gas not in self._derived:
+                parts = DERIVED_GASES[gas]
+                bounds = sorted(self._slices[p] for p in parts)
+                if all(prev[1] == nxt[0] for prev, nxt in zip(bounds, bounds[1:])):
+                    # Components stored back to back: the total is just a wider slice
+                    self._derived[gas] = self.data.iloc[bounds[0][0]:bounds[-1][1]]
+                else:
+                    self._derived[gas] = pd.concat([self._slice(p) for p in parts], ignore_index=True)
+            return self._derived[gas]
+
+    def _slice(self, gas):
+        start, stop = self._slices[gas]
+        return self.data.iloc[start:stop]
+
+    def cube(self, gas):
+        """EmissionsCube for one gas, built once even when first requested concurrently."""
+        cube = self._cubes.get(gas)
+        if cube is None:
+            frame = self.frame(gas)
+            with self._lock:
+                if gas not in self._cubes:
+                    self._cubes[gas] = EmissionsCube.from_frame(frame)
+                cube = self._cubes[gas]
+        return cube
+
+    def summary(self, country_code, year, sector=None):
+        """
+        Per-gas emissions of one country in one year (optionally one sector),
+        with the matching global total and the country's share of it.
+        """
+        rows = []
+        for gas in self.gases:
+            cube = self.cube(gas)
+            country_total = cube.aggregate(countries=country_code, years=year, sectors=sector)
+            global_total = cube.aggregate(years=year, sectors=sector)
+            rows.append({
+                "gas": gas,
+                "country_emissions": country_total,
+                "global_emissions": global_total,
+                "share_pct": 100 * country_total / global_total if global_total else float("nan"),
+            })
+        return pd.DataFrame(rows).set_index("gas")
@@ -1,66 +1,273 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+START_YEAR = 2025
+BASE_FACTOR = 0.01  # 1% reduction per year baseline
+MAX_PRICE_FACTOR = 1.5  # max multiplier
+TYPE_MULTIPLIER = {
+    "Tax": 1.0,
+    "ETS": 0.9,
+    "Hybrid": 1.2,
+}
+SECTOR_FLAGS = ["covers_transport", "covers_industry", "covers_buildings", "covers_agriculture", "covers_lulucf"]
+SCENARIO_COLUMNS = ["country", "initial_emissions", "policy_type", "price_signal", "coverage", "duration_years",
+                    *SECTOR_FLAGS]
+# Optional scenario columns: business-as-usual annual growth (default 0) and first year
+OPTIONAL_COLUMNS = ["baseline_growth", "start_year"]
+
+
+def annual_reduction_rate(price_signal, coverage, num_sectors, policy_type,
+                          base_factor=BASE_FACTOR, max_price_factor=MAX_PRICE_FACTOR, type_multiplier=None):
+    """
+    Annual emission reduction rate for one scenario or, given arrays, for
+    many at once. `policy_type` may be a name (Tax/ETS/Hybrid) or an array of
+    names; unknown types use a multiplier of 1.0.
+    """
+    type_multiplier = TYPE_MULTIPLIER if type_multiplier is None else type_multiplier
+    if isinstance(policy_type, str):
+        multiplier = type_multiplier.get(policy_type, 1.0)
+    else:
+        multiplier = pd.Series(policy_type).map(type_multiplier).fillna(1.0).to_numpy(dtype=np.float64)
+    price_factor = np.minimum(np.asarray(price_signal, dtype=np.float64) / 100, max_price_factor)
+    coverage_factor = np.asarray(coverage, dtype=np.float64) / 100
+    sector_factor = np.asarray(num_sectors, dtype=np.float64) / 5
+    return base_factor * price_factor * coverage_factor * sector_factor * multiplier
+
+
+def _trajectories(initial_emissions, annual_reduction, horizon, growth=0.0):
+    # Compounding in closed form: E_t = E_0 * ((1 + g)(1 - r))^t, floored at
+    # zero (as the year-by-year loop did) so r >= 1 drops straight to 0
+    steps = np.arange(horizon + 1)
+    retained = np.maximum((1 + growth) * (1 - annual_reduction), 0.0)[:, None] ** steps
+    emissions = np.maximum(initial_emissions[:, None] * retained, 0.0)
+    emissions[:, 0] = initial_emissions
+    return emissions
+
+
+def _bau_final(initial_emissions, duration_years, growth=0.0):
+    # Business-as-usual end point without the policy: E_0 * (1 + g)^t
+    return initial_emissions * (1 + np.asarray(growth, dtype=np.float64)) ** duration_years
+
+
+def _metrics(initial_emissions, final_emissions, annual_reduction, duration_years, growth=0.0):
+    # total/percent reduction compare with the starting emissions; the *_vs_bau
+    # pair compares with the business-as-usual trajectory, which is what the
+    # policy changes when the baseline grows or declines (they match for g = 0)
+    total_reduction = initial_emissions - final_emissions
+    bau_final = _bau_final(initial_emissions, duration_years, growth)
+    reduction_vs_bau = bau_final - final_emissions
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(initial_emissions != 0, total_reduction / initial_emissions * 100, 0.0)
+        average = np.where(duration_years > 0, total_reduction / duration_years, np.nan)
+        percent_vs_bau = np.where(bau_final != 0, reduction_vs_bau / bau_final * 100, 0.0)
+    return {
+        "annual_reduction": annual_reduction,
+        "total_reduction": total_reduction,
+        "final_emissions": final_emissions,
+        "percent_reduction": percent,
+        "average_reduction": average,
+        "initial_emissions": initial_emissions,
+        "bau_final_emissions": bau_final,
+        "reduction_vs_bau": reduction_vs_bau,
+        "percent_reduction_vs_bau": percent_vs_bau,
+    }
+
+
 def forecast_policy_impact(policy_input):
     """
     Forecast CO2 emissions based on simplified policy assumptions.
     """
-    country = policy_input["country"]
     initial_emissions = policy_input["initial_emissions"]  # MtCO₂e
-    policy_type = policy_input["policy_type"]
-    price_signal = policy_input["price_signal"]
-    coverage = policy_input["coverage"]
     duration_years = policy_input["duration_years"]
+    num_sectors = sum(policy_input[flag] for flag in SECTOR_FLAGS)
 
-    # Sectoral binary toggles
-    sectors = [
-        policy_input["covers_transport"],
-        policy_input["covers_industry"],
-        policy_input["covers_buildings"],
-        policy_input["covers_agriculture"],
-        policy_input["covers_lulucf"],
-    ]
-
-    num_sectors = sum(sectors)
-
-    # Define base effectiveness factor
-    base_factor = 0.01  # 1% reduction per year baseline
-    price_factor = min(price_signal / 100, 1.5)  # max multiplier
-    coverage_factor = coverage / 100
-    sector_factor = num_sectors / 5
-
-    # Policy multiplier based on type
-    type_multiplier = {
-        "Tax": 1.0,
-        "ETS": 0.9,
-        "Hybrid": 1.2,
-    }.get(policy_type, 1.0)
-
-    # Final annual reduction rate
-    annual_reduction = (
-        base_factor * price_factor * coverage_factor * sector_factor * type_multiplier
-    )
+    annual_reduction = float(annual_reduction_rate(
+        policy_input["price_signal"], policy_input["coverage"], num_sectors, policy_input["policy_type"]
+    ))
 
     # Forecast emissions
-    years = list(range(2025, 2025 + duration_years + 1))
-    emissions = [initial_emissions]
-    for _ in range(duration_years):
-        last = emissions[-1]
-        reduced = last * (1 - annual_reduction)
-        emissions.append(max(reduced, 0))  # Avoid negative emissions
-        total_reductions = initial_emissions - emissions[-1]
-        reduction_percent = (total_reductions / initial_emissions) * 100 if initial_emissions else 0
-        average_reduction = (total_reductions / duration_years)
-
+    emissions = _trajectories(np.array([initial_emissions], dtype=np.float64),
+                              np.array([annual_reduction]), duration_years)[0]
+    years = list(range(START_YEAR, START_YEAR + duration_years + 1))
     forecast_df = pd.DataFrame({"Year": years, "Projected Emissions (MtCO₂e)": emissions})
 
-    metrics = {
-        "annual_reduction": annual_reduction,
-        "total_reduction": initial_emissions - emissions[-1],
-        "final_emissions": emissions[-1],
-        "percent_reduction": reduction_percent,
-        "average_reduction": average_reduction,
-    }
+    metrics = {name: float(value) for name, value in _metrics(
+        initial_emissions, emissions[-1], annual_reduction, duration_years
+    ).items()}
+    return forecast_df, metrics
 
-    metrics["initial_emissions"] = initial_emissions
 
-    return forecast_df, metrics
+def _check_scenarios(scenarios, start_year):
+    missing = [column for column in SCENARIO_COLUMNS if column not in scenarios.columns]
+    if missing:
+        raise KeyError(f"Scenarios missing columns: {missing}")
+    growth = (scenarios["baseline_growth"].to_numpy(dtype=np.float64) if "baseline_growth" in scenarios.columns
+              else np.zeros(len(scenarios)))
+    start = (scenarios["start_year"].to_numpy(dtype=np.int64) if "start_year" in scenarios.columns
+             else np.full(len(scenarios), start_year, dtype=np.int64))
+    return growth, start
+
+
+def forecast_scenarios(scenarios, start_year=START_YEAR):
+    """
+    Forecast many policy scenarios at once. `scenarios` is a DataFrame with
+    SCENARIO_COLUMNS (one row per scenario, plus any OPTIONAL_COLUMNS);
+    every trajectory is computed in a single NumPy broadcast. Returns
+    (forecast_df, metrics_df): the long-format trajectories (scenario,
+    country, Year, Projected Emissions) and one row of metrics per scenario.
+    With a baseline_growth, reductions against the business-as-usual path
+    E_0 * (1 + g)^t are in reduction_vs_bau and percent_reduction_vs_bau.
+    """
+    growth, start = _check_scenarios(scenarios, start_year)
+
+    initial = scenarios["initial_emissions"].to_numpy(dtype=np.float64)
+    duration = scenarios["duration_years"].to_numpy(dtype=np.int64)
+    num_sectors = scenarios[SECTOR_FLAGS].to_numpy(dtype=np.float64).sum(axis=1)
+    rate = annual_reduction_rate(scenarios["price_signal"], scenarios["coverage"], num_sectors,
+                                 scenarios["policy_type"].to_numpy())
+
+    horizon = int(duration.max()) if len(duration) else 0
+    emissions = _trajectories(initial, rate, horizon, growth)
+    final = emissions[np.arange(len(duration)), duration]
+
+    # Long format: keep each scenario's own years only
+    steps = np.arange(horizon + 1)
+    keep = steps[None, :] <= duration[:, None]
+    scenario_ids, step_ids = np.nonzero(keep)
+    forecast_df = pd.DataFrame({
+        "scenario": scenarios.index.to_numpy()[scenario_ids],
+        "country": scenarios["country"].to_numpy()[scenario_ids],
+        "Year": start[scenario_ids] + step_ids,
+        "Projected Emissions (MtCO₂e)": emissions[keep],
+    })
+
+    metrics_df = pd.DataFrame({
+        "scenario": scenarios.index.to_numpy(),
+        "country": scenarios["country"].to_numpy(),
+        **_metrics(initial, final, rate, duration, growth),
+    })
+    return forecast_df, metrics_df
+
+
+# --- Monte Carlo mode ---
+# Each parameter is ("fixed", value) or (numpy Generator method, *args),
+# e.g. ("normal", mean, sd), ("uniform", low, high), ("triangular", left, mode, right).
+DEFAULT_DISTRIBUTIONS = {
+    "base_factor": ("triangular", 0.005, 0.01, 0.015),
+    "max_price_factor": ("uniform", 1.0, 2.0),
+    "type_multiplier": {
+        "Tax": ("normal", 1.0, 0.1),
+        "ETS": ("normal", 0.9, 0.1),
+        "Hybrid": ("normal", 1.2, 0.15),
+    },
+}
+PERCENTILES = (5, 50, 95)
+# Upper bound on scenario x draw x year values held in memory per chunk
+MAX_CHUNK_VALUES = 4_000_000
+
+
+def _sample(rng, spec, size):
+    name, *args = spec
+    if name == "fixed":
+        return np.full(size, float(args[0]))
+    # Factors are never negative
+    return np.maximum(getattr(rng, name)(*args, size=size), 0.0)
+
+
+def _simulate_chunk(chunk, n_draws, distributions, seed, percentiles):
+    initial, price, coverage, num_sectors, policy_type, duration, growth = chunk
+    rng = np.random.default_rng(seed)
+    size = (len(initial), n_draws)
+
+    base_factor = _sample(rng, distributions["base_factor"], size)
+    price_cap = _sample(rng, distributions["max_price_factor"], size)
+    multiplier = np.ones(size)
+    for name, spec in distributions["type_multiplier"].items():
+        rows = policy_type == name
+        if rows.any():
+            multiplier[rows] = _sample(rng, spec, (int(rows.sum()), n_draws))
+
+    rate = (base_factor * np.minimum(price[:, None] / 100, price_cap)
+            * (coverage / 100 * num_sectors / 5)[:, None] * multiplier)
+
+    # (scenario, draw, year) trajectories in closed form, then percentiles over draws
+    horizon = int(duration.max())
+    retained = np.maximum((1 + growth[:, None]) * (1 - rate), 0.0)[:, :, None] ** np.arange(horizon + 1)
+    emissions = np.maximum(initial[:, None, None] * retained, 0.0)
+    emissions[:, :, 0] = initial[:, None]
+    bands = np.percentile(emissions, percentiles, axis=1)  # (percentile, scenario, year)
+    rate_median = np.median(rate, axis=1)
+    return bands, rate_median
+
+
+def forecast_scenarios_mc(scenarios, n_draws=1000, distributions=None, seed=0, chunk_size=None,
+                          max_workers=None, percentiles=PERCENTILES, start_year=START_YEAR):
+    """
+    Monte Carlo version of forecast_scenarios: the base factor, price-factor
+    cap and type multipliers are sampled from `distributions` (defaults in
+    DEFAULT_DISTRIBUTIONS) for `n_draws` draws per scenario.
+
+    Scenarios are simulated in chunks sized to keep memory bounded, spread
+    over a thread pool. Each chunk gets its own stream from
+    SeedSequence(seed), so results are reproducible for a given seed and
+    chunk_size whatever the number of workers.
+
+    Returns (forecast_df, summary_df): long-format P5/P50/P95 trajectories per
+    scenario and year, and per-scenario median annual reduction with the
+    final-emission percentiles and the business-as-usual final emissions.
+    """
+    growth, start = _check_scenarios(scenarios, start_year)
+    distributions = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+
+    initial = scenarios["initial_emissions"].to_numpy(dtype=np.float64)
+    price = scenarios["price_signal"].to_numpy(dtype=np.float64)
+    coverage = scenarios["coverage"].to_numpy(dtype=np.float64)
+    num_sectors = scenarios[SECTOR_FLAGS].to_numpy(dtype=np.float64).sum(axis=1)
+    policy_type = scenarios["policy_type"].to_numpy(dtype=object)
+    duration = scenarios["duration_years"].to_numpy(dtype=np.int64)
+    if not len(initial):
+        raise ValueError("No scenarios to forecast")
+
+    horizon = int(duration.max())
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_VALUES // (n_draws * (horizon + 1)))
+    starts = range(0, len(initial), chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    chunks = [tuple(values[start:start + chunk_size]
+                    for values in (initial, price, coverage, num_sectors, policy_type, duration, growth))
+              for start in starts]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(
+            lambda args: _simulate_chunk(args[0], n_draws, distributions, args[1], percentiles),
+            zip(chunks, seeds),
+        ))
+
+    # Pad each chunk's bands to the overall horizon before stacking
+    bands = np.concatenate([
+        np.pad(chunk_bands, ((0, 0), (0, 0), (0, horizon + 1 - chunk_bands.shape[2])))
+        for chunk_bands, _ in results
+    ], axis=1)
+    rate_median = np.concatenate([rate for _, rate in results])
+
+    keep = np.arange(horizon + 1)[None, :] <= duration[:, None]
+    scenario_ids, step_ids = np.nonzero(keep)
+    forecast_df = pd.DataFrame({
+        "scenario": scenarios.index.to_numpy()[scenario_ids],
+        "country": scenarios["country"].to_numpy()[scenario_ids],
+        "Year": start[scenario_ids] + step_ids,
+        **{f"P{p}": bands[i][keep] for i, p in enumerate(percentiles)},
+    })
+
+    final = bands[:, np.arange(len(duration)), duration]
+    summary_df = pd.DataFrame({
+        "scenario": scenarios.index.to_numpy(),
+        "country": scenarios["country"].to_numpy(),
+        "initial_emissions": initial,
+        "annual_reduction_median": rate_median,
+        **{f"final_emissions_P{p}": final[i] for i, p in enumerate(percentiles)},
+        "bau_final_emissions": _bau_final(initial, duration, growth),
+    })
+    return forecast_df, summary_df
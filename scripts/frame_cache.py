@@ -0,0 +1,76 @@
+import os
+import re
+import hashlib
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "processed", "cache")
+
+
+def source_signature(*paths):
+    """Return a short key built from each source file's path, size and mtime."""
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}")
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path(name, *paths):
+    """Location of the columnar cache file for a frame built from `paths`."""
+    key = source_signature(*paths)
+    return os.path.join(CACHE_DIR, f"{name}_{key}.parquet")
+
+
+def read_cached_frame(path):
+    """Memory-map a cached Parquet frame, or return None if it is missing/unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path, engine="pyarrow", memory_map=True)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def write_cached_frame(df, path):
+    """Write `df` atomically so concurrent workers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, path)
+    except (ImportError, OSError, ValueError, TypeError):
+        # No Parquet engine or read-only data dir: fall back to uncached loads
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    _remove_stale(path)
+    return True
+
+
+def cached_frame(name, paths, builder):
+    """
+    Build-once loader: return the cached frame for `paths` if the sources are
+    unchanged, otherwise call `builder()` and persist its result.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    path = cache_path(name, *paths)
+    df = read_cached_frame(path)
+    if df is None:
+        df = builder()
+        write_cached_frame(df, path)
+    return df
+
+
+def _remove_stale(path):
+    # Drop older cache files for the same dataset (source was modified)
+    current = os.path.basename(path)
+    name = current.rsplit("_", 1)[0]
+    pattern = re.compile(re.escape(name) + r"_[0-9a-f]{16}\.parquet$")
+    for fname in os.listdir(os.path.dirname(path)):
+        if fname != current and pattern.match(fname):
+            try:
+                os.remove(os.path.join(os.path.dirname(path), fname))
+            except OSError:
+                pass
@@ -1,6 +1,7 @@
 import os
 import sys
 import pandas as pd
+from functools import partial
 
 # Base directory setup for cross-folder imports and file access
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -17,6 +18,8 @@ from sector_vulnerability import get_sector_vulnerability_by_country
 from co_benefit_analyzer import get_country_trends
 from resilience_index import gain_trend_for_country
 from co_benefit_analyzer import load_life_expectancy_data
+from parallel_loader import load_parallel
+from owid_functions import load_owid_data, GDP_COLUMNS
 
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
@@ -31,16 +34,17 @@ def generate_country_story(country_name):
     edgar_path = os.path.join(DATA_DIR, "EDGAR_AR5_GHG_1970_2023.xlsx")
     gain_path = os.path.join(DATA_DIR, "nd_gain", "gain.csv")
     sector_data_path = os.path.join(DATA_DIR, "nd_gain", "vulnerability")
-    energy_path = os.path.join(DATA_DIR, "owid-energy-data.csv")
     lifeexp_path = os.path.join(DATA_DIR, "owid_life_expectancy.csv")
     pm25_path = os.path.join(DATA_DIR, "PM2.5_WHO.csv")
 
     try:
-        vectors = pd.read_csv(vectors_path)
-        gain = pd.read_csv(gain_path)
-        energy = pd.read_csv(energy_path)
-        life = pd.read_csv(lifeexp_path)
-        pm25 = pd.read_csv(pm25_path)
+        vectors, gain, energy, life, pm25 = load_parallel([
+            ("policy_vectors", partial(pd.read_csv, vectors_path)),
+            ("nd_gain", partial(pd.read_csv, gain_path)),
+            ("owid_energy", partial(load_owid_data, GDP_COLUMNS)),
+            ("life_expectancy", partial(pd.read_csv, lifeexp_path)),
+            ("pm25", partial(pd.read_csv, pm25_path)),
+        ])
     except Exception as e:
         return {"error": f"❌ Failed to load required data: {e}"}
 
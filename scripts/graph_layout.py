@@ -0,0 +1,76 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import networkx as nx
+
+# Above this many nodes use the faster large-graph layout
+LARGE_GRAPH_NODES = 300
+# Iterations when refining a warm-started layout
+WARM_START_ITERATIONS = 25
+
+_positions = OrderedDict()  # graph hash -> node positions
+_last_by_scope = {}         # view scope -> hash of its latest layout
+_lock = threading.Lock()
+_MAX_CACHED = 64
+
+
+def graph_key(G):
+    """Stable hash of a graph's nodes and edges (attributes are ignored)."""
+    digest = hashlib.sha1()
+    for node in sorted(map(repr, G.nodes())):
+        digest.update(node.encode("utf-8"))
+    digest.update(b"|")
+    for u, v in sorted((repr(u), repr(v)) for u, v in G.edges()):
+        digest.update(f"{u}->{v};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compute_layout(G, scope=None, k=0.8, iterations=100, seed=42):
+    """
+    Node positions for `G`, cached by graph hash. When `scope` (e.g. the
+    intent/country being viewed) was laid out before, the previous positions
+    seed the new layout, so adding a node only needs a short refinement.
+    """
+    key = graph_key(G)
+    with _lock:
+        if key in _positions:
+            _positions.move_to_end(key)
+            if scope is not None:
+                _last_by_scope[scope] = key
+            return _positions[key]
+        previous = _positions.get(_last_by_scope.get(scope)) if scope is not None else None
+
+    initial = _warm_start(G, previous, seed) if previous else None
+    if initial is not None:
+        pos = nx.spring_layout(G, k=k, pos=initial, iterations=WARM_START_ITERATIONS, seed=seed)
+    elif len(G) > LARGE_GRAPH_NODES and hasattr(nx, "forceatlas2_layout"):
+        pos = nx.forceatlas2_layout(G, max_iter=iterations, seed=seed)
+    else:
+        # spring_layout switches to its sparse-matrix solver for large graphs
+        pos = nx.spring_layout(G, k=k, iterations=iterations, seed=seed)
+
+    with _lock:
+        _positions[key] = pos
+        if scope is not None:
+            _last_by_scope[scope] = key
+        while len(_positions) > _MAX_CACHED:
+            _positions.popitem(last=False)
+    return pos
+
+
+def _warm_start(G, previous, seed):
+    # Keep known nodes where they were; put new ones next to a placed neighbour
+    known = {node: previous[node] for node in G if node in previous}
+    if not known:
+        return None
+    rng = np.random.default_rng(seed)
+    initial = dict(known)
+    for node in G:
+        if node in initial:
+            continue
+        anchors = [initial[n] for n in nx.all_neighbors(G, node) if n in initial]
+        centre = np.mean(anchors, axis=0) if anchors else np.zeros(2)
+        initial[node] = centre + rng.normal(scale=0.05, size=2)
+    return initial
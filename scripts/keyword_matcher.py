@@ -0,0 +1,166 @@
+import weakref
+from collections import deque
+
+import numpy as np
+from scipy import sparse
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over the keyword lists of an activity table, with
+    an inverted index from keyword to the rows that list it. One pass over a
+    text finds every keyword that occurs in it as a substring, which gives the
+    same per-row scores as testing `kw in text` for every keyword of every row.
+    """
+
+    def __init__(self, keyword_lists):
+        self.keyword_lists = [list(kws) for kws in keyword_lists]
+        self.n_rows = len(self.keyword_lists)
+
+        # Inverted index: keyword -> (row positions, times listed in that row)
+        index = {}
+        for pos, kws in enumerate(self.keyword_lists):
+            for kw in kws:
+                rows = index.setdefault(kw, {})
+                rows[pos] = rows.get(pos, 0) + 1
+        self.index = {
+            kw: (np.fromiter(rows.keys(), dtype=np.intp), np.fromiter(rows.values(), dtype=np.int64))
+            for kw, rows in index.items()
+        }
+
+        # An empty keyword is a substring of every text
+        self.base_scores = np.zeros(self.n_rows, dtype=np.int64)
+        if "" in self.index:
+            rows, counts = self.index[""]
+            self.base_scores[rows] += counts
+
+        self.keywords = [kw for kw in self.index if kw]
+        self._keyword_pos = {kw: i for i, kw in enumerate(self.keywords)}
+        self._keyword_matrix = None
+        self._build_automaton(self.keywords)
+
+    def _build_automaton(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for kw in keywords:
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(kw)
+
+        # Breadth-first failure links; outputs inherit those of their fallback state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """Set of keywords occurring in `text` (already lower-cased)."""
+        found = {""} if "" in self.index else set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def scores(self, text, found=None):
+        """Number of listed keywords per row that occur in `text`."""
+        found = self.find(text) if found is None else found
+        scores = self.base_scores.copy()
+        for kw in found:
+            if kw:
+                rows, counts = self.index[kw]
+                scores[rows] += counts
+        return scores
+
+    def best_match(self, text):
+        """
+        (row position, score, matched keywords) for the highest-scoring row;
+        ties go to the first row. Position is None when nothing matches.
+        """
+        found = self.find(text)
+        scores = self.scores(text, found)
+        if not self.n_rows:
+            return None, 0, []
+        best = int(np.argmax(scores))
+        if scores[best] == 0:
+            return None, 0, []
+        return best, int(scores[best]), [kw for kw in self.keyword_lists[best] if kw in found]
+
+    # --- Batch scoring ---
+    @property
+    def keyword_matrix(self):
+        """Sparse keyword x row matrix of how often each row lists each keyword."""
+        if self._keyword_matrix is None:
+            kw_pos, row_pos, counts = [], [], []
+            for i, kw in enumerate(self.keywords):
+                rows, row_counts = self.index[kw]
+                kw_pos.append(np.full(len(rows), i))
+                row_pos.append(rows)
+                counts.append(row_counts)
+            self._keyword_matrix = sparse.csr_matrix(
+                (np.concatenate(counts or [[]]), (np.concatenate(kw_pos or [[]]), np.concatenate(row_pos or [[]]))),
+                shape=(len(self.keywords), self.n_rows), dtype=np.int64,
+            )
+        return self._keyword_matrix
+
+    def document_matrix(self, found_sets):
+        """Sparse document x keyword presence matrix from `find` results."""
+        indptr, indices = [0], []
+        for found in found_sets:
+            indices.extend(self._keyword_pos[kw] for kw in found if kw)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(found_sets), len(self.keywords)))
+
+    def best_matches(self, texts):
+        """
+        Vectorised `best_match` for many (lower-cased) texts. Returns arrays of
+        best row positions (-1 for no match) and scores, and the list of
+        matched keywords per text.
+        """
+        found_sets = [self.find(text) for text in texts]
+        scores = (self.document_matrix(found_sets) @ self.keyword_matrix).toarray() + self.base_scores
+        if not self.n_rows:
+            return np.full(len(found_sets), -1), np.zeros(len(found_sets), dtype=np.int64), [[] for _ in found_sets]
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+        best[best_scores == 0] = -1
+        matched = [
+            [kw for kw in self.keyword_lists[pos] if kw in found] if pos >= 0 else []
+            for pos, found in zip(best, found_sets)
+        ]
+        return best, best_scores, matched
+
+
+_matchers = {}
+
+
+def matcher_for(df_activity):
+    """
+    KeywordMatcher for an activity table's `Keywords` column, compiled on
+    first use and kept for as long as the table itself is alive.
+    """
+    key = id(df_activity)
+    if key not in _matchers:
+        _matchers[key] = KeywordMatcher(df_activity["Keywords"])
+        weakref.finalize(df_activity, _matchers.pop, key, None)
+    return _matchers[key]
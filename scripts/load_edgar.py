@@ -1,24 +1,72 @@
 import pandas as pd
 import os
 
-def load_edgar_ipcc2006(filepath="data/EDGAR_AR5_GHG_1970_2023.xlsx", sheet_name="IPCC 2006"):
-    return _load_edgar_file(filepath, sheet_name)
+from frame_cache import cached_frame, cache_path
 
-def load_edgar_co2(filepath="data/EDGAR_CO2_1970_2023.xlsx", sheet_name="IPCC 2006"):
-    return _load_edgar_file(filepath, sheet_name)
+def load_edgar_ipcc2006(filepath="data/EDGAR_AR5_GHG_1970_2023.xlsx", sheet_name="IPCC 2006", compact=False):
+    return _load_edgar_file(filepath, sheet_name, compact=compact)
 
-def load_edgar_co2bio(filepath="data/EDGAR_CO2bio_1970_2023.xlsx", sheet_name="IPCC 2006"):
-    return _load_edgar_file(filepath, sheet_name)
+def load_edgar_co2(filepath="data/EDGAR_CO2_1970_2023.xlsx", sheet_name="IPCC 2006", compact=False):
+    return _load_edgar_file(filepath, sheet_name, compact=compact)
 
-def load_edgar_ch4(filepath="data/EDGAR_CH4_1970_2023.xlsx", sheet_name="IPCC 2006"):
-    return _load_edgar_file(filepath, sheet_name)
+def load_edgar_co2bio(filepath="data/EDGAR_CO2bio_1970_2023.xlsx", sheet_name="IPCC 2006", compact=False):
+    return _load_edgar_file(filepath, sheet_name, compact=compact)
 
-def load_edgar_n2o(filepath="data/EDGAR_N2O_1970_2023.xlsx", sheet_name="IPCC 2006"):
-    return _load_edgar_file(filepath, sheet_name)
+def load_edgar_ch4(filepath="data/EDGAR_CH4_1970_2023.xlsx", sheet_name="IPCC 2006", compact=False):
+    return _load_edgar_file(filepath, sheet_name, compact=compact)
 
-def _load_edgar_file(filepath, sheet_name):
+def load_edgar_n2o(filepath="data/EDGAR_N2O_1970_2023.xlsx", sheet_name="IPCC 2006", compact=False):
+    return _load_edgar_file(filepath, sheet_name, compact=compact)
+
+# Dimension columns of the long-format EDGAR frame
+EDGAR_DIMENSIONS = [
+    "Country_code_A3", "Name",
+    "ipcc_code_2006_for_standard_report",
+    "ipcc_code_2006_for_standard_report_name",
+    "Substance", "fossil_bio",
+]
+
+def _full_path(filepath):
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    full_path = os.path.join(base_dir, filepath)
+    return os.path.join(base_dir, filepath)
+
+def _cache_name(full_path, sheet_name):
+    return f"{os.path.splitext(os.path.basename(full_path))[0]}_{sheet_name}".replace(" ", "_")
+
+def is_edgar_cached(filepath, sheet_name="IPCC 2006", compact=False):
+    """True if loading `filepath` would read the frame cache rather than parse the workbook."""
+    full_path = _full_path(filepath)
+    name = _cache_name(full_path, sheet_name) + ("_compact" if compact else "")
+    try:
+        return os.path.exists(cache_path(name, full_path))
+    except OSError:
+        return False
+
+def _load_edgar_file(filepath, sheet_name, use_cache=True, compact=False):
+    full_path = _full_path(filepath)
+    if not use_cache:
+        df_long = _parse_edgar_file(full_path, sheet_name)
+        return compact_edgar_frame(df_long) if compact else df_long
+
+    # Parse the workbook once; later loads memory-map the columnar copy
+    name = _cache_name(full_path, sheet_name)
+    if compact:
+        # Stored dictionary-encoded, so categories are read without materialising strings
+        return cached_frame(f"{name}_compact", full_path,
+                            lambda: compact_edgar_frame(_load_edgar_file(filepath, sheet_name)))
+    return cached_frame(name, full_path, lambda: _parse_edgar_file(full_path, sheet_name))
+
+def compact_edgar_frame(df_long):
+    """
+    Compact schema for the long EDGAR frame: category dimensions, int16 year,
+    float32 emissions and no redundant emissions_gg column.
+    """
+    df_long = df_long.drop(columns=["emissions_gg"], errors="ignore")
+    dtypes = {col: "category" for col in EDGAR_DIMENSIONS if col in df_long.columns}
+    dtypes.update({"year": "int16", "emissions_mtco2e": "float32"})
+    return df_long.astype(dtypes)
+
+def _parse_edgar_file(full_path, sheet_name):
     df = pd.read_excel(full_path, sheet_name=sheet_name, header=9)
 
     # Identify year columns
@@ -26,10 +74,7 @@ def _load_edgar_file(filepath, sheet_name):
 
     # Melt wide to long format
     df_long = df.melt(
-        id_vars=["Country_code_A3", "Name", 
-                 "ipcc_code_2006_for_standard_report", 
-                 "ipcc_code_2006_for_standard_report_name", 
-                 "Substance", "fossil_bio"],
+        id_vars=EDGAR_DIMENSIONS,
         value_vars=year_cols,
         var_name="year",
         value_name="emissions_gg"
@@ -40,7 +85,7 @@ def _load_edgar_file(filepath, sheet_name):
     df_long['emissions_mtco2e'] = df_long['emissions_gg'] / 1000
     df_long.dropna(subset=["emissions_mtco2e"], inplace=True)
 
-    return df_long
+    return df_long.reset_index(drop=True)
 
 def load_population(filepath="data/total_population_un.csv"):
     df = pd.read_csv(filepath, encoding="utf-8", skiprows = 4)
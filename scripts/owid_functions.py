@@ -1,7 +1,47 @@
+import os
 import pandas as pd
 
-def load_owid_data():
-    return pd.read_csv("data/owid-energy-data.csv")
+OWID_ENERGY_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "owid-energy-data.csv"))
+
+# Column sets used by the pages; pass one of these (or any list) to load_owid_data
+RENEWABLE_COLUMNS = [
+    "country", "iso_code", "year",
+    "renewables_share_energy", "solar_share_elec", "wind_share_elec", "hydro_share_elec",
+    "fossil_electricity", "low_carbon_electricity", "electricity_generation",
+]
+ENERGY_MIX_COLUMNS = [
+    "country", "iso_code", "year",
+    "coal_consumption", "oil_consumption", "gas_consumption",
+    "solar_consumption", "wind_consumption", "hydro_consumption", "biofuel_consumption",
+    "population", "gdp",
+]
+GDP_COLUMNS = ["country", "iso_code", "year", "gdp"]
+
+_CATEGORY_COLUMNS = ("country", "iso_code")
+_projections = {}
+
+def load_owid_data(columns=None):
+    """
+    Load the OWID energy CSV, reading only `columns` (all by default).
+    Country names and ISO codes are categorical, year is int16 and every
+    other column float32. Each projection is parsed once per process and
+    shared, so treat the returned frame as read-only.
+    """
+    key = tuple(sorted(columns)) if columns is not None else None
+    if key not in _projections:
+        if columns is None:
+            # Full table: downcast whatever parsed as float64
+            df = pd.read_csv(OWID_ENERGY_PATH, dtype={col: "category" for col in _CATEGORY_COLUMNS})
+            df = df.astype({col: "float32" for col in df.select_dtypes("float64").columns})
+            df["year"] = df["year"].astype("int16")
+        else:
+            dtypes = {col: "float32" for col in columns}
+            dtypes.update({col: "category" for col in _CATEGORY_COLUMNS if col in dtypes})
+            if "year" in dtypes:
+                dtypes["year"] = "int16"
+            df = pd.read_csv(OWID_ENERGY_PATH, usecols=list(columns), dtype=dtypes)
+        _projections[key] = df
+    return _projections[key]
 
 # 1. Renewable share over time (Q1 + Q2)
 def renewable_share_over_time(df, country_code):
@@ -43,7 +83,7 @@ def fastest_growth_in_renewables(df, start_year, end_year, top_n=10):
     
     # Aggregate to ensure unique iso_code-year pairs
     grouped = (
-        subset.groupby(["iso_code", "year"])["renewables_share_energy"]
+        subset.groupby(["iso_code", "year"], observed=True)["renewables_share_energy"]
         .mean()
         .reset_index()
     )
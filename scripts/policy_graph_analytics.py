@@ -0,0 +1,264 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Node fields (as written by build_policy_node / page 20) used by the engine
+ID, INTENT, COUNTRY, SECTOR, ALIGNMENT, IMPACT = (
+    "Policy Node", "Graph Intent", "Country", "Sector", "Alignment", "CO₂ Impact (Mt ±)"
+)
+DIMENSIONS = {INTENT: 0, COUNTRY: 1, SECTOR: 2}
+ALIGNMENT_CODES = {"Positive": 1, "Negative": -1}
+
+
+class PolicyGraphEngine:
+    """
+    Analytics over policy graphs (intent -> country -> policy, with each
+    policy also tied to its sector). Nodes live in compact columnar arrays
+    with dimension values interned to integer codes, and per
+    (intent, country, sector) cell totals are updated incrementally on every
+    add/remove. Rollups and conflict queries only scan the cells, not the
+    nodes, so they stay fast for 100k+ policies.
+
+    One engine may be shared by concurrent sessions: updates and queries
+    take an internal lock. `store_version` is the PolicyNodeStore version
+    the engine mirrors (None if unknown), so callers can tell when to rebuild.
+    """
+
+    def __init__(self, capacity=1024):
+        self._labels = [[], [], []]
+        self._lookup = [{}, {}, {}]
+        self._codes = np.zeros((capacity, 3), dtype=np.int32)
+        self._alignment = np.zeros(capacity, dtype=np.int8)
+        self._impact = np.zeros(capacity, dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._ids = []
+        self._rows_by_id = {}
+        self._size = 0
+        # cell -> [impact sum, policies, positive, negative]
+        self._cells = {}
+        self._lock = threading.Lock()
+        self.store_version = None
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        engine = cls(capacity=max(1024, len(nodes)))
+        for node in nodes:
+            engine.add(node)
+        return engine
+
+    @classmethod
+    def from_store(cls, store):
+        # Version first: a write landing while the nodes are read leaves the
+        # engine marked stale rather than silently missing it
+        version = store.version()
+        engine = cls.from_nodes(store.all())
+        engine.store_version = version
+        return engine
+
+    def __len__(self):
+        with self._lock:
+            return len(self._ids) - int((~self._alive[:self._size]).sum())
+
+    def _advance(self, store_version):
+        # `store_version` is the version our own write produced, so we are
+        # still in sync only if it directly follows the one we mirror
+        if store_version is None or store_version == self.store_version:
+            return
+        if self.store_version is not None and store_version == self.store_version + 1:
+            self.store_version = store_version
+        else:
+            self.store_version = None
+
+    # --- Updates ---
+    def _code(self, dim, value):
+        value = "N/A" if value is None else str(value)
+        code = self._lookup[dim].get(value)
+        if code is None:
+            code = len(self._labels[dim])
+            self._lookup[dim][value] = code
+            self._labels[dim].append(value)
+        return code
+
+    def _grow(self):
+        capacity = len(self._alive) * 2
+        self._codes = np.resize(self._codes, (capacity, 3))
+        for name in ("_alignment", "_impact", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _update_cell(self, row, sign):
+        cell = tuple(self._codes[row])
+        totals = self._cells.setdefault(cell, [0.0, 0, 0, 0])
+        impact = self._impact[row]
+        totals[0] += sign * (0.0 if np.isnan(impact) else impact)
+        totals[1] += sign
+        totals[2] += sign * (self._alignment[row] == 1)
+        totals[3] += sign * (self._alignment[row] == -1)
+        if totals[1] == 0:
+            del self._cells[cell]
+
+    def add(self, node, store_version=None):
+        """
+        Add one node dict and return its row. Pass the version returned by
+        PolicyNodeStore.add for the same node to keep `store_version` current.
+        """
+        with self._lock:
+            row = self._add(node)
+            self._advance(store_version)
+            return row
+
+    def _add(self, node):
+        if self._size == len(self._alive):
+            self._grow()
+        row = self._size
+        self._size += 1
+        self._codes[row] = [self._code(dim, node.get(field)) for field, dim in DIMENSIONS.items()]
+        self._alignment[row] = ALIGNMENT_CODES.get(node.get(ALIGNMENT), 0)
+        impact = node.get(IMPACT)
+        self._impact[row] = np.nan if impact is None else float(impact)
+        self._alive[row] = True
+        self._ids.append(node.get(ID))
+        self._rows_by_id.setdefault(node.get(ID), []).append(row)
+        self._update_cell(row, +1)
+        return row
+
+    def remove(self, node_id, store_version=None):
+        """
+        Remove every node with this Policy Node id (as the store does);
+        returns how many. `store_version` as for add().
+        """
+        with self._lock:
+            rows = self._rows_by_id.pop(node_id, [])
+            for row in rows:
+                self._alive[row] = False
+                self._update_cell(row, -1)
+            self._advance(store_version)
+            return len(rows)
+
+    # --- Queries ---
+    def _cell_frame(self):
+        if not self._cells:
+            return pd.DataFrame(columns=[INTENT, COUNTRY, SECTOR, "impact_mt", "policies", "positive", "negative"])
+        keys = np.array(list(self._cells.keys()), dtype=np.int32)
+        totals = np.array(list(self._cells.values()), dtype=np.float64)
+        frame = pd.DataFrame({
+            field: np.asarray(self._labels[dim], dtype=object)[keys[:, dim]] for field, dim in DIMENSIONS.items()
+        })
+        frame["impact_mt"] = totals[:, 0]
+        frame[["policies", "positive", "negative"]] = totals[:, 1:].astype(np.int64)
+        return frame
+
+    @staticmethod
+    def _filter(frame, graph_intent=None, country=None, sector=None):
+        for field, value in ((INTENT, graph_intent), (COUNTRY, country), (SECTOR, sector)):
+            if value is not None:
+                frame = frame[frame[field] == value]
+        return frame
+
+    def rollup(self, by=(INTENT,), graph_intent=None, country=None, sector=None):
+        """
+        Total CO₂e impact (Mt), policy count and positive/negative counts
+        grouped by any of Graph Intent, Country and Sector.
+        """
+        if isinstance(by, str):
+            by = [by]
+        with self._lock:
+            cells = self._cell_frame()
+        frame = self._filter(cells, graph_intent, country, sector)
+        columns = ["impact_mt", "policies", "positive", "negative"]
+        if not by:
+            return frame[columns].sum()
+        return frame.groupby(list(by), sort=True)[columns].sum().reset_index()
+
+    def conflicts(self, graph_intent=None, country=None):
+        """
+        (intent, country, sector) groups that hold both Positive and Negative
+        policies, with their counts and net impact.
+        """
+        with self._lock:
+            cells = self._cell_frame()
+        frame = self._filter(cells, graph_intent, country)
+        frame = frame[(frame["positive"] > 0) & (frame["negative"] > 0)]
+        return frame.sort_values("policies", ascending=False).reset_index(drop=True)
+
+    def conflicting_policies(self, graph_intent, country, sector):
+        """Policy Node ids on each side of a conflict: {'Positive': [...], 'Negative': [...]}."""
+        with self._lock:
+            codes = [self._lookup[dim].get(str(value)) for value, dim in
+                     ((graph_intent, 0), (country, 1), (sector, 2))]
+            if None in codes:
+                return {"Positive": [], "Negative": []}
+            live = slice(0, self._size)
+            in_cell = self._alive[live] & (self._codes[live] == codes).all(axis=1)
+            ids = np.asarray(self._ids, dtype=object)
+            return {
+                "Positive": ids[in_cell & (self._alignment[live] == 1)].tolist(),
+                "Negative": ids[in_cell & (self._alignment[live] == -1)].tolist(),
+            }
+
+    def adjacency(self):
+        """
+        Sparse symmetric adjacency over hubs and live policies. Node order:
+        intents, then (intent, country) hubs, then sectors, then policy rows.
+        Returns (matrix, labels).
+        """
+        with self._lock:
+            return self._adjacency()
+
+    def _adjacency(self):
+        rows = np.flatnonzero(self._alive[:self._size])
+        codes = self._codes[rows]
+        n_intents, n_countries, n_sectors = (len(labels) for labels in self._labels)
+
+        # intent -> country hub -> policy, and policy -> sector
+        hub_keys, hub_codes = np.unique(codes[:, 0] * n_countries + codes[:, 1], return_inverse=True)
+        hub_offset = n_intents
+        sector_offset = hub_offset + len(hub_keys)
+        policy_offset = sector_offset + n_sectors
+        policy_nodes = policy_offset + np.arange(len(rows))
+
+        src = np.concatenate([hub_keys // max(n_countries, 1), hub_offset + hub_codes, policy_nodes])
+        dst = np.concatenate([hub_offset + np.arange(len(hub_keys)), policy_nodes, sector_offset + codes[:, 2]])
+        size = policy_offset + len(rows)
+        matrix = sparse.coo_matrix((np.ones(len(src)), (src, dst)), shape=(size, size)).tocsr()
+        matrix = ((matrix + matrix.T) > 0).astype(np.float64)
+
+        labels = (
+            [f"intent:{label}" for label in self._labels[0]]
+            + [f"country:{self._labels[0][k // n_countries]}/{self._labels[1][k % n_countries]}" for k in hub_keys]
+            + [f"sector:{label}" for label in self._labels[2]]
+            + [self._ids[row] for row in rows]
+        )
+        return matrix, labels
+
+    def centrality(self, method="degree", top_n=20, alpha=0.85, iterations=100, tol=1e-10):
+        """
+        Most central nodes by normalised degree or PageRank (power iteration
+        on the sparse adjacency). Returns a frame of node label and score.
+        """
+        matrix, labels = self.adjacency()
+        n = matrix.shape[0]
+        if n == 0:
+            return pd.DataFrame(columns=["node", method])
+        degree = np.asarray(matrix.sum(axis=1)).ravel()
+        if method == "degree":
+            scores = degree / max(n - 1, 1)
+        elif method == "pagerank":
+            inv_degree = np.divide(1.0, degree, out=np.zeros_like(degree), where=degree > 0)
+            transition = sparse.diags(inv_degree) @ matrix
+            scores = np.full(n, 1.0 / n)
+            for _ in range(iterations):
+                dangling = scores[degree == 0].sum()
+                new = alpha * (transition.T @ scores + dangling / n) + (1 - alpha) / n
+                done = np.abs(new - scores).sum() < tol
+                scores = new
+                if done:
+                    break
+        else:
+            raise ValueError(f"Unknown centrality method: {method}")
+        top = np.argsort(-scores, kind="stable")[:top_n]
+        return pd.DataFrame({"node": [labels[i] for i in top], method: scores[top]})
@@ -1,15 +1,18 @@
 # policy_graph_module.py
 
-import os
-import json
 import uuid
 import pandas as pd
 from datetime import datetime
 
+from keyword_matcher import matcher_for
+from emission_units import parse_co2e_impact
+from policy_node_store import PolicyNodeStore, DB_PATH
+
 # === 1. Loaders ===
 def load_activity_table(path):
     df = pd.read_csv(path)
     df['Keywords'] = df['Keywords'].fillna('').apply(lambda x: [kw.strip().lower() for kw in x.split(',')])
+    df['impact_per_unit'] = df['CO₂e Impact'].map(parse_co2e_impact)
     return df
 
 def load_country_factors(path):
@@ -19,20 +22,14 @@ def load_country_factors(path):
 
 # === 2. Core Classification ===
 def classify_policy(policy_text, df_activity):
-    policy_text = policy_text.lower()
-    match_scores = [sum(1 for kw in row['Keywords'] if kw in policy_text) for _, row in df_activity.iterrows()]
-    best_idx = pd.Series(match_scores).idxmax()
-    if match_scores[best_idx] == 0:
+    best_pos, _, _ = matcher_for(df_activity).best_match(policy_text.lower())
+    if best_pos is None:
         return None
-    return df_activity.iloc[best_idx]
+    return df_activity.iloc[best_pos]
 
 # === 3. Estimators ===
 def parse_emission_value(val):
-    try:
-        val = val.replace('–', '-').replace('+', '').replace('tons', '').replace('Mt', 'e6').replace('kt', 'e3')
-        return float(eval(val.strip().split()[0]))
-    except:
-        return None
+    return parse_co2e_impact(val)
 
 def estimate_units(row, input_value, country_row):
     if row['Required Input Type'] == 'budget':
@@ -44,8 +41,8 @@ def estimate_units(row, input_value, country_row):
     return input_value
 
 def estimate_emission(row, units):
-    impact_per_unit = parse_emission_value(row['CO₂e Impact'])
-    return round(units * impact_per_unit, 2) if impact_per_unit is not None else None
+    impact_per_unit = row['impact_per_unit'] if 'impact_per_unit' in row else parse_emission_value(row['CO₂e Impact'])
+    return round(units * impact_per_unit, 2) if not pd.isna(impact_per_unit) else None
 
 # === 4. Policy Node Builder ===
 def build_policy_node(policy_text, country, user_input, graph_intent, df_activity, df_country):
@@ -79,19 +76,17 @@ def build_policy_node(policy_text, country, user_input, graph_intent, df_activit
     }
 
 # === 5. Save/Load Graph State ===
-def save_policy_node(node, path='data/policy_nodes.json'):
-    if os.path.exists(path):
-        with open(path, 'r') as f:
-            data = json.load(f)
-    else:
-        data = []
-    data.append(node)
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
-
-def load_policy_nodes(path='data/policy_nodes.json'):
-    if os.path.exists(path):
-        with open(path, 'r') as f:
-            return json.load(f)
-    return []
+# One store per database path, so the schema/migration setup runs once per process
+_stores = {}
+
+def _store(db_path):
+    if db_path not in _stores:
+        _stores[db_path] = PolicyNodeStore(db_path)
+    return _stores[db_path]
+
+def save_policy_node(node, db_path=DB_PATH):
+    _store(db_path).add(node)
+
+def load_policy_nodes(db_path=DB_PATH):
+    return _store(db_path).all()
 
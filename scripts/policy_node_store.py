@@ -0,0 +1,172 @@
+import os
+import json
+import sqlite3
+from contextlib import contextmanager
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DB_PATH = os.path.join(BASE_DIR, "data", "policy_nodes.db")
+LEGACY_JSON_PATH = os.path.join(BASE_DIR, "data", "policy_nodes.json")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    node_id TEXT,
+    graph_intent TEXT,
+    country TEXT,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_node_id ON nodes (node_id);
+CREATE INDEX IF NOT EXISTS idx_nodes_graph_intent ON nodes (graph_intent);
+CREATE INDEX IF NOT EXISTS idx_nodes_country ON nodes (country);
+CREATE INDEX IF NOT EXISTS idx_nodes_date ON nodes (date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class PolicyNodeStore:
+    """
+    Policy graph nodes in SQLite (WAL mode). Each node is kept as its full
+    JSON dict, with Policy Node, Graph Intent, Country and Date copied into
+    indexed columns for filtering. Every write is its own transaction, so
+    concurrent Streamlit sessions can add and delete nodes safely.
+
+    On first use the store imports the legacy data/policy_nodes.json once.
+    """
+
+    def __init__(self, path=DB_PATH, legacy_json_path=LEGACY_JSON_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        if legacy_json_path and os.path.exists(legacy_json_path):
+            self.migrate_json(legacy_json_path)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation: safe across threads/sessions
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _version(conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    @classmethod
+    def _bump_version(cls, conn):
+        # Write counter, bumped in the same transaction as every change; the
+        # new value is read back before commit, so it is exactly this write's
+        conn.execute("INSERT INTO meta (key, value) VALUES ('version', 1) "
+                     "ON CONFLICT(key) DO UPDATE SET value = value + 1")
+        return cls._version(conn)
+
+    @staticmethod
+    def _row(node):
+        return (node.get("Policy Node"), node.get("Graph Intent"), node.get("Country"),
+                node.get("Date"), json.dumps(node, ensure_ascii=False))
+
+    # --- Writes ---
+    def add(self, node):
+        """Append one node and return the store version this write produced."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO nodes (node_id, graph_intent, country, date, data) VALUES (?, ?, ?, ?, ?)",
+                self._row(node),
+            )
+            return self._bump_version(conn)
+
+    def add_many(self, nodes):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO nodes (node_id, graph_intent, country, date, data) VALUES (?, ?, ?, ?, ?)",
+                [self._row(node) for node in nodes],
+            )
+            self._bump_version(conn)
+
+    def delete(self, node_id):
+        """
+        Delete every node with this Policy Node id and return the store
+        version this write produced. The version moves even when nothing
+        matched, so it always identifies this call's write.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM nodes WHERE node_id = ?", (node_id,))
+            return self._bump_version(conn)
+
+    def migrate_json(self, json_path):
+        """Import a legacy JSON node list once; later calls are no-ops."""
+        key = f"migrated:{os.path.basename(json_path)}"
+        # Cheap check first so startup doesn't parse the JSON every time
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return False
+        with open(json_path, "r") as f:
+            nodes = json.load(f)
+        with self._connect() as conn:
+            # Checked again under the write lock in case another process migrated meanwhile
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return False
+            conn.executemany(
+                "INSERT INTO nodes (node_id, graph_intent, country, date, data) VALUES (?, ?, ?, ?, ?)",
+                [self._row(node) for node in nodes],
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(nodes))))
+            self._bump_version(conn)
+        return True
+
+    # --- Reads ---
+    def query(self, graph_intent=None, country=None, start_date=None, end_date=None):
+        """Nodes matching every given filter, in insertion order. Dates are 'YYYY-MM-DD' strings."""
+        clauses, params = [], []
+        for column, op, value in (("graph_intent", "=", graph_intent), ("country", "=", country),
+                                  ("date", ">=", start_date), ("date", "<=", end_date)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(str(value))
+        sql = "SELECT data FROM nodes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY id", params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def all(self):
+        return self.query()
+
+    def graph_intents(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT graph_intent FROM nodes WHERE graph_intent IS NOT NULL").fetchall()
+        return sorted(value for (value,) in rows)
+
+    def countries(self, graph_intent=None):
+        sql = "SELECT DISTINCT country FROM nodes WHERE country IS NOT NULL"
+        params = []
+        if graph_intent is not None:
+            sql += " AND graph_intent = ?"
+            params.append(graph_intent)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return sorted(value for (value,) in rows)
+
+    def version(self):
+        """
+        Number of committed writes so far. Any add or delete, from any
+        process, changes it, so a cache built at one version is stale once
+        the version moves on.
+        """
+        with self._connect() as conn:
+            return self._version(conn)
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
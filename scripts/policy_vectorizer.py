@@ -1,7 +1,19 @@
+import os
+import re
+import time
+import hashlib
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+GEN_INFO_PATH = os.path.join(BASE_DIR, "data", "gen_info.csv")
+POLICY_VECTORS_PATH = os.path.join(BASE_DIR, "data", "policy_vectors.csv")
+
+SECTOR_COLUMNS = ["Transport", "Industry", "Buildings", "Agricultural emissions", "LULUCF"]
+
 def score_policy_vector(row):
     today = datetime.today().year
 
@@ -51,3 +63,236 @@ def score_policy_vector(row):
         "policy_type_ets": policy_type_ets,
         "policy_type_hybrid": policy_type_hybrid,
     }
+
+
+def _text(df, column, default=""):
+    # str() of every cell, as score_policy_vector does (missing -> "nan")
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[column].map(str)
+
+
+def _as_int_if_integral(values):
+    return values.astype(np.int64) if (values % 1 == 0).all() else values
+
+
+# --- Feature extractors ---
+# name -> (source columns, function(df) -> dict of column -> Series).
+# Every extractor works on whole columns, so adding one never adds a
+# row-wise pass over the policy table.
+FEATURES = {}
+
+_feature_cache = OrderedDict()  # (feature, input fingerprint) -> DataFrame
+_MAX_CACHED = 128
+_last_timings = []
+
+
+def register_feature(name, columns=()):
+    """Decorator adding an extractor to FEATURES; `columns` are the gen_info columns it reads."""
+    def decorator(func):
+        FEATURES[name] = (tuple(columns), func)
+        return func
+    return decorator
+
+
+@register_feature("jurisdiction", ["Jurisdiction covered"])
+def _jurisdiction(df):
+    if "Jurisdiction covered" not in df.columns:
+        return {"jurisdiction": pd.Series("", index=df.index)}
+    return {"jurisdiction": df["Jurisdiction covered"]}
+
+
+@register_feature("status", ["Status"])
+def _status(df):
+    status = _text(df, "Status")
+    years = pd.to_numeric(status.str[-4:], errors="coerce")
+    return {
+        "duration_years": _as_int_if_integral((datetime.today().year - years).where(years.notna(), 0)),
+        "is_active": status.str.lower().str.contains("implemented", regex=False).astype(int),
+    }
+
+
+@register_feature("price_signal", ["Price on 1 April"])
+def _price_signal(df):
+    # First number of the price text, whatever its currency (legacy feature)
+    raw = _text(df, "Price on 1 April", "0").str.replace("€", "", regex=False).str.replace("US$", "", regex=False)
+    price = pd.to_numeric(raw.str.split().str[0], errors="coerce").fillna(0)
+    return {"price_signal": _as_int_if_integral(price)}
+
+
+@register_feature("legacy_sectors", SECTOR_COLUMNS)
+def _legacy_sectors(df):
+    # A sector counts as covered whenever its cell is filled in (including "No")
+    flags = []
+    for sector in SECTOR_COLUMNS:
+        if sector in df.columns:
+            flags.append((df[sector].notna() & (df[sector].map(str).str.strip() != "")).astype(int))
+        else:
+            flags.append(pd.Series(0, index=df.index))
+    names = ["covers_transport", "covers_industry", "covers_buildings", "covers_agriculture", "covers_lulucf"]
+    return {"num_sectors_covered": sum(flags), **dict(zip(names, flags))}
+
+
+@register_feature("overlap", ["Relation to other instruments"])
+def _overlap(df):
+    relation = _text(df, "Relation to other instruments").str.lower()
+    return {
+        "subsidy_overlap": relation.str.contains("subsidy", regex=False).astype(int),
+        "tax_relief_overlap": relation.str.contains("relief", regex=False).astype(int),
+    }
+
+
+@register_feature("policy_type", ["Type"])
+def _policy_type(df):
+    policy_type = _text(df, "Type").str.lower()
+    return {
+        "policy_type_tax": policy_type.str.contains("tax", regex=False).astype(int),
+        "policy_type_ets": (policy_type.str.contains("ets", regex=False)
+                            | policy_type.str.contains("trading", regex=False)).astype(int),
+        "policy_type_hybrid": policy_type.str.contains("hybrid", regex=False).astype(int),
+    }
+
+
+def _usd_amount(text, suffix=""):
+    # e.g. "NOK1,174 (US$107.78)*" -> 107.78; a bare "US$5" is already in dollars
+    usd = text.str.extract(rf"\(US\$\s*([\d,]+(?:\.\d+)?)\s*{suffix}", expand=False)
+    bare = text.str.extract(rf"^\s*US\$\s*([\d,]+(?:\.\d+)?)\s*{suffix}", expand=False)
+    return pd.to_numeric(usd.fillna(bare).str.replace(",", "", regex=False), errors="coerce")
+
+
+@register_feature("price_usd", ["Price on 1 April"])
+def _price_usd(df):
+    price = _usd_amount(_text(df, "Price on 1 April"))
+    return {"price_usd": price.fillna(0.0), "has_price": price.notna().astype(int)}
+
+
+@register_feature("revenue", ["Government revenue"])
+def _revenue(df):
+    return {"revenue_usd_million": _usd_amount(_text(df, "Government revenue"), "million").fillna(0.0)}
+
+
+GASES = ["CO2", "CH4", "N2O", "HFCs", "PFCs", "SF6", "Other"]
+
+
+@register_feature("gases", ["Gases covered"])
+def _gases(df):
+    gases = _text(df, "Gases covered").str.replace(" ", "", regex=False).str.lower()
+    covers_all = gases == "all"
+    tokens = "," + gases + ","
+    flags = {f"gas_{gas.lower()}": (tokens.str.contains(f",{gas.lower()},", regex=False)
+                                    | (covers_all & (gas != "Other"))).astype(int)
+             for gas in GASES}
+    return {"num_gases_covered": sum(flags.values()), **flags}
+
+
+@register_feature("emissions_share", ["Share of jurisdiction emissions covered", "Share of global emissions covered"])
+def _emissions_share(df):
+    def share(column):
+        if column not in df.columns:
+            return pd.Series(0.0, index=df.index)
+        return pd.to_numeric(df[column], errors="coerce").fillna(0.0)
+    return {
+        "share_jurisdiction_emissions": share("Share of jurisdiction emissions covered"),
+        "share_global_emissions": share("Share of global emissions covered"),
+    }
+
+
+# Same ten sectors as policy_analysis.sectoral_coverage_summary
+PRICED_SECTOR_COLUMNS = [
+    "Electricity and heat", "Industry", "Mining and extractives",
+    "Transport", "Aviation", "Buildings",
+    "Agriculture, forestry and fishing fuel use", "Agricultural emissions",
+    "Waste", "LULUCF",
+]
+
+
+@register_feature("sector_coverage", PRICED_SECTOR_COLUMNS)
+def _sector_coverage(df):
+    # Unlike the legacy flags, only an explicit "Yes" counts as priced
+    flags = {}
+    for sector in PRICED_SECTOR_COLUMNS:
+        name = "sector_" + re.sub(r"[^a-z]+", "_", sector.lower()).strip("_")
+        flags[name] = (_text(df, sector).str.strip().str.lower() == "yes").astype(int)
+    return {"num_sectors_priced": sum(flags.values()), **flags}
+
+
+# The original 15 columns of score_policy_vector
+DEFAULT_FEATURES = ["jurisdiction", "status", "price_signal", "legacy_sectors", "overlap", "policy_type"]
+
+
+def _fingerprint(df, columns):
+    digest = hashlib.sha1(str(len(df)).encode())
+    for column in columns:
+        digest.update(column.encode("utf-8"))
+        if column in df.columns:
+            digest.update(pd.util.hash_pandas_object(df[column], index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def extract_features(df, names=None):
+    """
+    Run the named extractors (all of FEATURES by default) over `df` and
+    return their columns side by side, one row per policy. Each extractor's
+    output is cached by a hash of the columns it reads, so re-running after
+    registering a new feature only computes the new one.
+    """
+    names = list(FEATURES) if names is None else list(names)
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise KeyError(f"Unknown features: {unknown}")
+
+    # Durations depend on the current year, so it is part of every key
+    year = datetime.today().year
+    parts, timings = [], []
+    for name in names:
+        columns, func = FEATURES[name]
+        key = (name, year, _fingerprint(df, columns))
+        started = time.perf_counter()
+        part = _feature_cache.get(key)
+        cached = part is not None
+        if cached:
+            _feature_cache.move_to_end(key)
+        else:
+            part = pd.DataFrame(func(df), index=df.index)
+            _feature_cache[key] = part
+            while len(_feature_cache) > _MAX_CACHED:
+                _feature_cache.popitem(last=False)
+        timings.append({"feature": name, "columns": part.shape[1], "cached": cached,
+                        "seconds": time.perf_counter() - started})
+        parts.append(part)
+
+    _last_timings[:] = timings
+    return pd.concat(parts, axis=1).reset_index(drop=True)
+
+
+def feature_timings():
+    """Per-extractor timings of the last extract_features call."""
+    return pd.DataFrame(_last_timings, columns=["feature", "columns", "cached", "seconds"])
+
+
+def vectorize_policies(df):
+    """
+    Column-wise equivalent of `df.apply(score_policy_vector, axis=1)`:
+    the same feature columns for every row at once.
+    """
+    return extract_features(df, DEFAULT_FEATURES)
+
+
+def clean_policy_vectors(df_vectorized):
+    """Drop rows without a jurisdiction or a known start year."""
+    df_vectorized = df_vectorized.dropna(subset=["jurisdiction"])
+    df_vectorized = df_vectorized[df_vectorized["jurisdiction"].str.strip() != ""]
+    return df_vectorized[df_vectorized["duration_years"] > 0]
+
+
+def write_policy_vectors(source=GEN_INFO_PATH, output=POLICY_VECTORS_PATH, names=DEFAULT_FEATURES):
+    """
+    Extract the named features (the clustering columns, DEFAULT_FEATURES, by
+    default) from `source` and atomically write the cleaned vectors to
+    `output`; returns the row count.
+    """
+    vectors = clean_policy_vectors(extract_features(pd.read_csv(source), names))
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    vectors.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, output)
+    return len(vectors)
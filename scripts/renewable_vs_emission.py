@@ -37,10 +37,10 @@ def lag_correlation(df_emission, df_renew, country_code, lag=2):
 # 4. Country ranking: Emission reduction with renewable growth
 def emission_reduction_vs_renewable_growth(df_emission, df_renew, year_start, year_end):
     # Aggregate start and end values per country
-    em_start = df_emission[df_emission["year"] == year_start].groupby("Country_code_A3")["emissions_mtco2e"].sum()
-    em_end = df_emission[df_emission["year"] == year_end].groupby("Country_code_A3")["emissions_mtco2e"].sum()
-    renew_start = df_renew[df_renew["year"] == year_start].groupby("iso_code")["renewables_share_energy"].mean()
-    renew_end = df_renew[df_renew["year"] == year_end].groupby("iso_code")["renewables_share_energy"].mean()
+    em_start = df_emission[df_emission["year"] == year_start].groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum()
+    em_end = df_emission[df_emission["year"] == year_end].groupby("Country_code_A3", observed=True)["emissions_mtco2e"].sum()
+    renew_start = df_renew[df_renew["year"] == year_start].groupby("iso_code", observed=True)["renewables_share_energy"].mean()
+    renew_end = df_renew[df_renew["year"] == year_end].groupby("iso_code", observed=True)["renewables_share_energy"].mean()
 
     df_compare = pd.DataFrame({
         "emission_change_pct": ((em_end - em_start) / em_start * 100),
@@ -76,7 +76,7 @@ def fossil_electricity_trend(df_renew, country_code):
 # 8. Sector-wise emissions trend comparison (with renewable growth)
 def sector_emission_vs_renewable(df_emission, df_renew, country_code, sector_keyword):
     sector_df = df_emission[(df_emission["Country_code_A3"] == country_code) &
-                            (df_emission["ipcc_code_2006_for_standard_report_name"].str.contains(sector_keyword, case=False))][["year", "emissions_mtco2e"]]
+                            (df_emission["ipcc_code_2006_for_standard_report_name"].str.contains(sector_keyword, case=False, na=False))][["year", "emissions_mtco2e"]]
 
     renew = df_renew[df_renew["iso_code"] == country_code][["year", "renewables_share_energy"]]
 
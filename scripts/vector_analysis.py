@@ -1,7 +1,16 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from sklearn.manifold import TSNE
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
 
 def normalize_vectors(df):
     scaler = StandardScaler()
@@ -17,3 +26,178 @@ def compute_tsne(df, n_components=2, perplexity=30, random_state=42):
     tsne = TSNE(n_components=n_components, perplexity=perplexity, random_state=random_state)
     X_tsne = tsne.fit_transform(df)
     return pd.DataFrame(X_tsne, columns=[f"TSNE{i+1}" for i in range(n_components)])
+
+
+# --- Clustering service ---
+# Results are cached by a hash of the feature matrix and the parameters, so
+# reruns of the clustering page (e.g. moving the k slider) are lookups.
+K_RANGE = range(2, 11)
+
+_embeddings = OrderedDict()  # (data hash, perplexity, seed) -> embeddings dict
+_clusterings = OrderedDict() # (data hash, k values, seed) -> clustering dict
+_lock = threading.Lock()
+_MAX_CACHED = 16
+
+
+def data_key(X):
+    """Stable hash of a feature matrix (values and column names)."""
+    X = pd.DataFrame(X)
+    digest = hashlib.sha1(repr(list(X.columns)).encode("utf-8"))
+    digest.update(np.ascontiguousarray(X.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def _cached(cache, key, compute):
+    with _lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = compute()
+    with _lock:
+        cache[key] = value
+        while len(cache) > _MAX_CACHED:
+            cache.popitem(last=False)
+    return value
+
+
+def policy_embeddings(X, perplexity=5, random_state=42):
+    """
+    Scaled matrix plus 2-D PCA and t-SNE embeddings of `X`. Returns a dict
+    with "scaled", "pca", "explained_variance" and "tsne".
+    """
+    def compute():
+        scaled = StandardScaler().fit_transform(X)
+        pca, explained = compute_pca(scaled)
+        # t-SNE needs perplexity below the number of samples
+        tsne_perplexity = min(perplexity, max(len(scaled) - 1, 1))
+        tsne = TSNE(n_components=2, perplexity=tsne_perplexity, learning_rate=200,
+                    random_state=random_state).fit_transform(scaled)
+        return {
+            "scaled": scaled,
+            "pca": pca,
+            "explained_variance": explained,
+            "tsne": pd.DataFrame(tsne, columns=["TSNE1", "TSNE2"]),
+        }
+    return _cached(_embeddings, (data_key(X), perplexity, random_state), compute)
+
+
+def _fit_kmeans(scaled, k, random_state):
+    model = KMeans(n_clusters=k, random_state=random_state, n_init=10).fit(scaled)
+    silhouette = silhouette_score(scaled, model.labels_) if len(set(model.labels_)) > 1 else np.nan
+    return k, model, silhouette
+
+
+def cluster_policies(X, k_values=K_RANGE, perplexity=5, random_state=42, max_workers=None):
+    """
+    Fit KMeans for every k in `k_values` on the scaled matrix, in parallel,
+    reusing the cached embeddings. Returns a dict with "embeddings",
+    "models" (k -> fitted KMeans), "labels" (k -> labels) and "scores"
+    (a frame of k, inertia and silhouette).
+    """
+    embeddings = policy_embeddings(X, perplexity=perplexity, random_state=random_state)
+    scaled = embeddings["scaled"]
+    k_values = tuple(k for k in k_values if 2 <= k < len(scaled))
+
+    def compute():
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            fitted = list(pool.map(lambda k: _fit_kmeans(scaled, k, random_state), k_values))
+        models = {k: model for k, model, _ in fitted}
+        return {
+            "models": models,
+            "labels": {k: model.labels_ for k, model in models.items()},
+            "scores": pd.DataFrame({
+                "k": [k for k, _, _ in fitted],
+                "inertia": [model.inertia_ for _, model, _ in fitted],
+                "silhouette": [silhouette for _, _, silhouette in fitted],
+            }),
+        }
+    clustering = _cached(_clusterings, (data_key(X), k_values, random_state), compute)
+    return {"embeddings": embeddings, **clustering}
+
+
+# --- Out-of-sample projection ---
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PROJECTION_MODEL_PATH = os.path.join(BASE_DIR, "data", "processed", "policy_projection.npz")
+# Columns of policy_vectors.csv that are labels rather than clustering features
+META_COLUMNS = ["jurisdiction", "policy_type_tax", "policy_type_ets", "policy_type_hybrid"]
+
+
+class PolicyProjectionModel:
+    """
+    Fitted scaler + 2-D PCA + KMeans over policy vectors, kept as plain
+    arrays so new vectors can be placed into the existing PCA embedding and
+    cluster assignment without refitting. Refit in batch (see build_data.py)
+    when the policy table changes.
+    """
+
+    def __init__(self, columns, mean, scale, pca_mean, components, centers):
+        self.columns = list(columns)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.pca_mean = np.asarray(pca_mean, dtype=np.float64)
+        self.components = np.asarray(components, dtype=np.float64)
+        self.centers = np.asarray(centers, dtype=np.float64)
+
+    @classmethod
+    def fit(cls, X, n_clusters=4, random_state=42):
+        X = X.drop(columns=META_COLUMNS, errors="ignore")
+        scaler = StandardScaler().fit(X)
+        scaled = scaler.transform(X)
+        pca = PCA(n_components=2).fit(scaled)
+        kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10).fit(scaled)
+        return cls(X.columns, scaler.mean_, scaler.scale_, pca.mean_, pca.components_, kmeans.cluster_centers_)
+
+    @property
+    def n_clusters(self):
+        return len(self.centers)
+
+    def _scaled(self, vectors):
+        # Align by column name (arrays are taken to be in self.columns order);
+        # features a vector lacks sit at the training mean
+        if isinstance(vectors, dict):
+            values = np.array([[vectors.get(column, np.nan) for column in self.columns]], dtype=np.float64)
+        elif isinstance(vectors, pd.Series):
+            values = vectors.reindex(self.columns).to_numpy(dtype=np.float64)[None, :]
+        elif isinstance(vectors, pd.DataFrame):
+            values = vectors.reindex(columns=self.columns).to_numpy(dtype=np.float64)
+        else:
+            values = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        values = np.where(np.isnan(values), self.mean, values)
+        return (values - self.mean) / self.scale
+
+    def transform(self, vectors):
+        """PC1/PC2 coordinates of `vectors` (a frame, row Series, dict or array)."""
+        return (self._scaled(vectors) - self.pca_mean) @ self.components.T
+
+    def predict(self, vectors):
+        """Nearest cluster centre for each vector."""
+        scaled = self._scaled(vectors)
+        distances = ((scaled[:, None, :] - self.centers[None, :, :]) ** 2).sum(axis=2)
+        return distances.argmin(axis=1)
+
+    def place(self, vectors):
+        """Frame of PC1, PC2 and Cluster for each vector."""
+        scaled = self._scaled(vectors)
+        coords = (scaled - self.pca_mean) @ self.components.T
+        distances = ((scaled[:, None, :] - self.centers[None, :, :]) ** 2).sum(axis=2)
+        return pd.DataFrame({"PC1": coords[:, 0], "PC2": coords[:, 1], "Cluster": distances.argmin(axis=1)})
+
+    def save(self, path=PROJECTION_MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, columns=np.array(self.columns, dtype=str), mean=self.mean, scale=self.scale,
+                 pca_mean=self.pca_mean, components=self.components, centers=self.centers)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=PROJECTION_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["columns"].tolist(), data["mean"], data["scale"],
+                       data["pca_mean"], data["components"], data["centers"])
+
+
+def write_projection_model(source, output=PROJECTION_MODEL_PATH, n_clusters=4):
+    """Refit the projection model on a policy vectors CSV and save it; returns the row count."""
+    X = pd.read_csv(source)
+    PolicyProjectionModel.fit(X, n_clusters=n_clusters).save(output)
+    return len(X)